@@ -16,8 +16,7 @@ class LeetCodeCommands(commands.Cog):
         await interaction.response.defer()
 
         try:
-            from utils.leetcode_api import LeetCodeAPI
-            leetcode_api = LeetCodeAPI()
+            leetcode_api = self.bot.leetcode_api
 
             user_stats = await leetcode_api.get_user_stats(username)
 
@@ -55,7 +54,7 @@ class LeetCodeCommands(commands.Cog):
                     inline=True
                 )
 
-            embed.set_footer(text="Stats update automatically every hour")
+            embed.set_footer(text="Stats update automatically, every 5 minutes for active solvers and up to every 6 hours otherwise")
 
             await interaction.followup.send(embed=embed)
             logger.info(f"{interaction.user.name} linked account: {username}")
@@ -211,8 +210,7 @@ class LeetCodeCommands(commands.Cog):
 
             leetcode_username = user_data['leetcode_username']
 
-            from utils.leetcode_api import LeetCodeAPI
-            leetcode_api = LeetCodeAPI()
+            leetcode_api = self.bot.leetcode_api
 
             success = await leetcode_api.update_user(
                 self.bot,
@@ -8,30 +8,33 @@ from datetime import datetime
 import logging
 
 logger = logging.getLogger('discord')
-from utils.leetcode_api import LeetCodeAPI
 
 class LanguageSelectView(discord.ui.View):
     """View with dropdown to select programming language"""
     
-    def __init__(self, question: dict, solutions: dict):
+    def __init__(self, question: dict, selected: str = "python"):
         super().__init__(timeout=None) 
         self.question = question
-        self.solutions = solutions
-        self.add_item(LanguageSelect(question, solutions))
+        self.add_item(LanguageSelect(question, selected))
 
-class LanguageSelect(discord.ui.Select):
-    """Dropdown menu for selecting programming language"""
+class LanguageSelect(discord.ui.DynamicItem[discord.ui.Select], template=r'lc_solution:(?P<question_id>[0-9]+)'):
+    """
+    Dropdown menu for selecting programming language.
+
+    The question id lives in the custom_id, so the dropdown keeps working after
+    a restart. discord.py rebuilds the item through from_custom_id on every
+    click, so every pick is a read from the bot's SolutionStore, and a language
+    that was never generated (lazy mode) is generated on first pick.
+    """
     
-    def __init__(self, question: dict, solutions: dict):
+    def __init__(self, question: dict, selected: str = "python"):
         self.question = question
-        self.solutions = solutions
         
         options = [
             discord.SelectOption(
                 label="Python",
                 value="python",
                 description="View solution in Python",
-                default=True
             ),
             discord.SelectOption(
                 label="JavaScript",
@@ -55,25 +58,46 @@ class LanguageSelect(discord.ui.Select):
                 description="View solution in Go",
             )
         ]
+        for option in options:
+            option.default = (option.value == selected)
         
         super().__init__(
-            placeholder="Choose a programming language...",
-            min_values=1,
-            max_values=1,
-            options=options
+            discord.ui.Select(
+                placeholder="Choose a programming language...",
+                min_values=1,
+                max_values=1,
+                options=options,
+                custom_id=f"lc_solution:{question['id']}"
+            )
         )
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Select, match):
+        question_id = int(match['question_id'])
+        daily_cog = interaction.client.get_cog('LeetCodeDaily')
+        question = await daily_cog.fetch_question(question_id) if daily_cog else None
+        return cls(question or {'id': question_id})
     
     async def callback(self, interaction: discord.Interaction):
         """Handle language selection"""
-        selected_lang = self.values[0]
+        selected_lang = self.item.values[0]
 
-        for option in self.options:
+        for option in self.item.options:
             option.default = (option.value == selected_lang)
 
-        solution_data = self.solutions.get(selected_lang, {})
+        if 'title' not in self.question:
+            await interaction.response.send_message(
+                f"❌ Question #{self.question['id']} is no longer available.",
+                ephemeral=True
+            )
+            return
 
+        # Reading or generating may outlast the 3s response window
+        await interaction.response.defer()
+        solutions = await interaction.client.solution_store.get_or_generate(self.question, [selected_lang])
+        solution_data = solutions.get(selected_lang, {})
         embeds = self.create_solution_embeds(self.question, solution_data, selected_lang)
-        await interaction.response.edit_message(embeds=embeds, view=self.view)
+        await interaction.edit_original_response(embeds=embeds, view=self.view)
     
     def create_solution_embeds(self, question: dict, solution_data: dict, language: str) -> list:
         lang_names = {
@@ -161,13 +185,12 @@ class LeetCodeDaily(commands.Cog):
         return None
 
     async def fetch_question(self, question_id: int):
-        """Fetch question from local JSON or fall back to LeetCode API by number."""
+        """Fetch question from local JSON or fall back to the problem catalog by number."""
         q = self.get_question_by_id(question_id)
         if q:
             return q
         try:
-            api = LeetCodeAPI()
-            problem = await api.get_problem_by_number(question_id)
+            problem = await self.bot.problem_catalog.fetch_by_number(question_id)
             if not problem:
                 return None
             return {
@@ -189,6 +212,15 @@ class LeetCodeDaily(commands.Cog):
             if q['id'] not in posted_ids:
                 return q
         return None
+
+    def get_upcoming_questions(self, posted_ids: list, count: int) -> list:
+        """
+        Up to `count` unposted questions in posting order (fewer when fewer are
+        left); once all are posted, just the first question, which is what
+        post_daily_leetcode_question falls back to
+        """
+        upcoming = [q for q in self.questions if q['id'] not in posted_ids][:count]
+        return upcoming or self.questions[:1]
     
     @app_commands.command(name="lc_question", description="Post today's LeetCode challenge")
     @app_commands.describe(question_id="Specific question ID (optional, picks next unposted if not provided)")
@@ -300,20 +332,12 @@ class LeetCodeDaily(commands.Cog):
                 )
                 return
             await interaction.followup.send(
-                "⏳ Generating solutions. This may take 30-60 seconds.\n",
+                "⏳ Generating solutions. This may take up to 30 seconds.\n",
                 ephemeral=True
             )
-            from utils.groq_api import GroqAPI
-            groq = GroqAPI()
-            
-            solutions = await groq.generate_multi_language_solutions(
-                question['title'],
-                question['description'],
-                question['difficulty'],
-                question.get('hints', [])
-            )
+            solutions = await self.bot.solution_store.get_or_generate(question, self.bot.solution_store.post_languages)
             
-            view = LanguageSelectView(question, solutions)
+            view = LanguageSelectView(question)
             
             python_solution = solutions.get('python', {})
             embeds = view.children[0].create_solution_embeds(question, python_solution, 'python')
@@ -342,6 +366,41 @@ class LeetCodeDaily(commands.Cog):
                 content=f"❌ Error posting solution: {str(e)}"
             )
     
+    @app_commands.command(name="lc_solution_invalidate", description="Delete stored solutions so they are regenerated")
+    @app_commands.describe(
+        question_id="Question ID (optional, all questions if not provided)",
+        language="Language (optional, all languages if not provided)"
+    )
+    @app_commands.choices(language=[
+        app_commands.Choice(name="Python", value="python"),
+        app_commands.Choice(name="JavaScript", value="javascript"),
+        app_commands.Choice(name="Java", value="java"),
+        app_commands.Choice(name="C++", value="cpp"),
+        app_commands.Choice(name="Go", value="go")
+    ])
+    @app_commands.checks.has_permissions(administrator=True)
+    async def invalidate_solutions(self, interaction: discord.Interaction, question_id: int = None,
+                                   language: app_commands.Choice[str] = None):
+        """Drop stored solutions for a question and/or language"""
+        try:
+            deleted = await self.bot.solution_store.invalidate(
+                question_id,
+                language.value if language else None
+            )
+            scope = f"question #{question_id}" if question_id else "all questions"
+            if language:
+                scope += f" ({language.name})"
+            await interaction.response.send_message(
+                f"✅ Deleted {deleted} stored solution(s) for {scope}",
+                ephemeral=True
+            )
+        except Exception as e:
+            logger.error(f"Error invalidating solutions: {e}")
+            await interaction.response.send_message(
+                f"❌ Error: {str(e)}",
+                ephemeral=True
+            )
+    
     @app_commands.command(name="lc_stats", description="View LeetCode daily challenge statistics")
     async def challenge_stats(self, interaction: discord.Interaction):
         """Show statistics about posted challenges"""
@@ -519,4 +578,5 @@ class LeetCodeDaily(commands.Cog):
         return embed
 
 async def setup(bot):
+    bot.add_dynamic_items(LanguageSelect)
     await bot.add_cog(LeetCodeDaily(bot))
\ No newline at end of file
@@ -8,6 +8,11 @@ import asyncio
 
 logger = logging.getLogger('discord')
 
+def is_bot_owner():
+    async def predicate(interaction: discord.Interaction) -> bool:
+        return await interaction.client.is_owner(interaction.user)
+    return app_commands.check(predicate)
+
 class TestCommands(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
@@ -31,19 +36,12 @@ class TestCommands(commands.Cog):
         await interaction.response.defer()
         
         try:
-            if not self.bot.db or not self.bot.db.pool:
-                await interaction.followup.send("Database pool not initialized!")
+            if not self.bot.db:
+                await interaction.followup.send("Database not initialized!")
                 return
             
-            async with self.bot.db.pool.acquire() as conn:
-                result = await conn.fetchval('SELECT 1')
-            
-            async with self.bot.db.pool.acquire() as conn:
-                tables = await conn.fetch("""
-                    SELECT table_name 
-                    FROM information_schema.tables 
-                    WHERE table_schema = 'public'
-                """)
+            await self.bot.db.ping()
+            tables = await self.bot.db.list_tables()
             
             user_count = len(await self.bot.db.get_all_users())
             
@@ -56,7 +54,7 @@ class TestCommands(commands.Cog):
             embed.add_field(name="Tables Found", value=str(len(tables)), inline=True)
             embed.add_field(name="Linked Users", value=str(user_count), inline=True)
             
-            table_list = "\n".join([f"- {t['table_name']}" for t in tables])
+            table_list = "\n".join([f"- {table}" for table in tables])
             embed.add_field(name="Tables", value=table_list or "None", inline=False)
             
             await interaction.followup.send(embed=embed)
@@ -79,9 +77,7 @@ class TestCommands(commands.Cog):
         await interaction.response.defer()
         
         try:
-            from utils.leetcode_api import LeetCodeAPI
-            
-            leetcode_api = LeetCodeAPI()
+            leetcode_api = self.bot.leetcode_api
             
             user_stats = await leetcode_api.get_user_stats(username)
             
@@ -404,6 +400,62 @@ class TestCommands(commands.Cog):
             except:
                 pass
     
+    @app_commands.command(name="db_stats", description="Database pool and query latency statistics")
+    @is_bot_owner()
+    async def db_stats(self, interaction: discord.Interaction):
+        try:
+            if not self.bot.db:
+                await interaction.response.send_message("Database not initialized!", ephemeral=True)
+                return
+            
+            metrics = self.bot.db.metrics
+            pool = self.bot.db.pool_status()
+            
+            embed = discord.Embed(
+                title="Database Statistics",
+                color=discord.Color.blue()
+            )
+            
+            if pool:
+                embed.add_field(
+                    name="Pool",
+                    value=f"{pool['size'] - pool['idle']} in use / {pool['size']} open / {pool['max']} max",
+                    inline=True
+                )
+            embed.add_field(
+                name="Checked Out",
+                value=f"{metrics.in_use} now, {metrics.peak_in_use} peak",
+                inline=True
+            )
+            embed.add_field(
+                name="Acquire Wait",
+                value=f"avg {metrics.acquire.average_ms:.1f}ms\n"
+                      f"p95 <= {metrics.acquire.percentile(95):.0f}ms\n"
+                      f"max {metrics.acquire.max * 1000:.1f}ms",
+                inline=True
+            )
+            embed.add_field(
+                name="Slow Queries",
+                value=f"{metrics.slow_queries} over {metrics.slow_query_ms:.0f}ms",
+                inline=True
+            )
+            
+            query_lines = [
+                f"`{name}` {histogram.summary()}"
+                for name, histogram in metrics.busiest(10)
+            ]
+            embed.add_field(
+                name="Queries (by total time)",
+                value="\n".join(query_lines)[:1024] or "No queries recorded",
+                inline=False
+            )
+            
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            
+        except Exception as e:
+            logger.error(f"DB stats failed: {e}")
+            await interaction.response.send_message(f"Error: {e}", ephemeral=True)
+    
     @app_commands.command(name="test_env", description="Check environment variables")
     @app_commands.checks.has_permissions(administrator=True)
     async def test_env(self, interaction: discord.Interaction):
@@ -470,9 +522,8 @@ class TestCommands(commands.Cog):
             results.append("[FAIL] **Bot Online**: Failed")
         
         try:
-            if self.bot.db and self.bot.db.pool:
-                async with self.bot.db.pool.acquire() as conn:
-                    await conn.fetchval('SELECT 1')
+            if self.bot.db:
+                await self.bot.db.ping()
                 results.append("[OK] **Database**: Connected")
             else:
                 results.append("[FAIL] **Database**: Not initialized")
@@ -480,8 +531,7 @@ class TestCommands(commands.Cog):
             results.append(f"[FAIL] **Database**: {str(e)[:50]}")
         
         try:
-            from utils.leetcode_api import LeetCodeAPI
-            api = LeetCodeAPI()
+            api = self.bot.leetcode_api
             test_user = await api.get_user_stats("testuser")
             results.append("[OK] **LeetCode API**: Accessible")
         except Exception as e:
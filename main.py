@@ -43,6 +43,13 @@ class LeetCodeBot(commands.Bot):
             owner_ids={744729824400244758, 708231383688019999},
         )
         self.db = None
+        self.leetcode_session = None
+        self.groq_session = None
+        self.leetcode_api = None
+        self.groq_api = None
+        self.solution_store = None
+        self.problem_cache = None
+        self.problem_catalog = None
     
     async def on_ready(self):
         logger.info(f'Logged in as {self.user} (ID: {self.user.id})')
@@ -65,6 +72,14 @@ class LeetCodeBot(commands.Bot):
             post_daily_leetcode_solution.start()
             logger.info('[TASK] post_daily_leetcode_solution started')
 
+        if not solution_pregeneration.is_running():
+            solution_pregeneration.start()
+            logger.info('[TASK] solution_pregeneration started')
+
+        if not problem_catalog_sync.is_running():
+            problem_catalog_sync.start()
+            logger.info('[TASK] problem_catalog_sync started')
+
         if not task_heartbeat.is_running():
             task_heartbeat.start()
             logger.info('[TASK] task_heartbeat started')
@@ -85,10 +100,32 @@ class LeetCodeBot(commands.Bot):
             logger.warning('Jishaku not available')
     
     async def setup_hook(self) -> None:
-        from utils.database import Database
-        self.db = Database()
+        from utils.database import create_database
+        self.db = create_database()
         await self.db.init_db()
         logger.info('Database initialized')
+
+        from utils.http_client import create_session
+        from utils.leetcode_api import LeetCodeAPI
+        from utils.groq_api import GroqAPI
+        self.leetcode_session = create_session('leetcode', limit_per_host=10, timeout=10)
+        self.groq_session = create_session('groq', limit_per_host=5, timeout=30)
+        self.leetcode_api = LeetCodeAPI(self.leetcode_session)
+        self.groq_api = GroqAPI(self.groq_session)
+
+        from utils.solution_store import SolutionStore
+        self.solution_store = SolutionStore(self.db, self.groq_api)
+
+        from utils.problem_cache import ProblemMetadataCache
+        self.problem_cache = ProblemMetadataCache(self.db, self.leetcode_api)
+        self.db.register_cache('problems', self.problem_cache.invalidate)
+
+        from utils.problem_catalog import ProblemCatalog
+        self.problem_catalog = ProblemCatalog(self.db, self.leetcode_api)
+        try:
+            await self.problem_catalog.load()
+        except Exception as e:
+            logger.error(f'Failed to load problem catalog: {e}')
         
         await self.load_cogs()
         
@@ -98,9 +135,20 @@ class LeetCodeBot(commands.Bot):
         except Exception as e:
             logger.error(f'Failed to sync commands: {e}')
 
+    async def close(self) -> None:
+        await super().close()
+
+        from utils.http_client import close_session
+        await close_session('leetcode', self.leetcode_session)
+        await close_session('groq', self.groq_session)
+
+        if self.db:
+            await self.db.close()
+
 
 _task_last_run: dict[str, datetime] = {}
 _task_error_counts: dict[str, int] = {}
+_task_metrics: dict[str, str] = {}
 
 def _task_status(task: tasks.Loop, name: str) -> str:
     running   = task.is_running()
@@ -114,10 +162,13 @@ def _task_status(task: tasks.Loop, name: str) -> str:
     last_str = last_run.strftime('%H:%M:%S')  if last_run  else 'never'
 
     status = 'RUNNING' if running else ('FAILED' if failed else 'STOPPED')
-    return (
+    line = (
         f"{name:<35} | {status:<12} | loops={count:<5} | "
         f"last_ran={last_str} | next={next_str} | errors={errors}"
     )
+    if name in _task_metrics:
+        line += f" | {_task_metrics[name]}"
+    return line
 
 @tasks.loop(seconds=10)
 async def task_heartbeat():
@@ -128,6 +179,14 @@ async def task_heartbeat():
     logger.debug(_task_status(ai_news_reminder,              'ai_news_reminder'))
     logger.debug(_task_status(post_daily_leetcode_question,  'post_daily_leetcode_question'))
     logger.debug(_task_status(post_daily_leetcode_solution,  'post_daily_leetcode_solution'))
+    logger.debug(_task_status(solution_pregeneration,        'solution_pregeneration'))
+    logger.debug(_task_status(problem_catalog_sync,          'problem_catalog_sync'))
+    if bot.leetcode_api:
+        logger.debug(f'[HEARTBEAT] LeetCode response cache: {bot.leetcode_api.cache.summary()}')
+    if bot.db:
+        logger.debug(f'[HEARTBEAT] User cache: {bot.db.user_cache.summary()}')
+        logger.debug(f'[HEARTBEAT] Database pool: {bot.db.pool_status()} {bot.db.metrics.pool_summary()}')
+        logger.debug(f'[HEARTBEAT] Database queries: {bot.db.metrics.summary()}')
     logger.debug('─' * 90)
 
 @task_heartbeat.before_loop
@@ -141,25 +200,45 @@ async def before_task_heartbeat():
             await asyncio.sleep(1)
 
 
-@tasks.loop(hours=1)
+_poll_scheduler = None
+
+@tasks.loop(minutes=5)
 async def submission_checker():
+    global _poll_scheduler
     _task_name = 'submission_checker'
     logger.info(f'[TASK:{_task_name}] Starting iteration #{submission_checker.current_loop}')
     try:
-        from utils.leetcode_api import LeetCodeAPI
+        if _poll_scheduler is None:
+            from utils.poll_scheduler import PollScheduler
+            budget = os.getenv('POLL_BUDGET_PER_HOUR')
+            _poll_scheduler = PollScheduler(
+                min_interval=int(os.getenv('POLL_MIN_INTERVAL', 300)),
+                max_interval=int(os.getenv('POLL_MAX_INTERVAL', 6 * 3600)),
+                budget_per_hour=int(budget) if budget else None
+            )
         
-        users = await bot.db.get_all_users()
-        logger.debug(f'[TASK:{_task_name}] Found {len(users)} user(s) to check')
-        leetcode_api = LeetCodeAPI()
+        users = await bot.db.get_users_for_refresh()
+        _poll_scheduler.sync(users)
+        due = _poll_scheduler.pop_due()
+        logger.debug(f'[TASK:{_task_name}] {len(due)}/{len(users)} user(s) due | {_poll_scheduler.summary()}')
         
-        for idx, (user_id, leetcode_username) in enumerate(users, 1):
-            try:
-                logger.debug(f'[TASK:{_task_name}] Checking ({idx}/{len(users)}): {leetcode_username}')
-                await leetcode_api.update_user(bot, user_id, leetcode_username)
-                await asyncio.sleep(2)
-            except Exception as e:
-                _task_error_counts[_task_name] = _task_error_counts.get(_task_name, 0) + 1
-                logger.error(f'[TASK:{_task_name}] Error updating {leetcode_username}: {e}')
+        if due:
+            leetcode_api = bot.leetcode_api
+            polled = set()
+            
+            def on_polled(discord_id, changed):
+                polled.add(discord_id)
+                _poll_scheduler.record(discord_id, changed)
+            
+            stats = await leetcode_api.update_users_batch(bot, due, on_polled=on_polled)
+            for user in due:
+                if user['discord_id'] not in polled:
+                    _poll_scheduler.record(user['discord_id'], None)
+            
+            if stats.failed:
+                _task_error_counts[_task_name] = _task_error_counts.get(_task_name, 0) + stats.failed
+            _task_metrics[_task_name] = f'{stats.summary()} | {_poll_scheduler.summary()}'
+            logger.debug(f'[TASK:{_task_name}] {stats.summary()} | batch size now {leetcode_api.batch_size.size}')
         
         _task_last_run[_task_name] = datetime.now()
         logger.info(f'[TASK:{_task_name}] Iteration #{submission_checker.current_loop} complete')
@@ -191,18 +270,12 @@ async def weekly_reset():
     try:
         if datetime.now().weekday() == 0:
             logger.info(f'[TASK:{_task_name}] It\'s Monday — running reset...')
-            await bot.db.reset_weekly_stats()
-            
             from utils.role_manager import RoleManager
             role_manager = RoleManager(bot.db)
             
-            for guild in bot.guilds:
-                users = await bot.db.get_all_users()
-                logger.debug(f'[TASK:{_task_name}] Updating roles for {len(users)} user(s) in guild {guild.name}')
-                for user_id, _ in users:
-                    member = guild.get_member(user_id)
-                    if member:
-                        await role_manager.update_user_role(member, guild)
+            changes = await bot.db.reset_weekly_stats(role_manager.tier_thresholds())
+            logger.debug(f'[TASK:{_task_name}] {len(changes)} user(s) changed tier')
+            await role_manager.apply_tier_changes(bot, changes)
             
             _task_last_run[_task_name] = datetime.now()
             logger.info(f'[TASK:{_task_name}] Weekly reset complete')
@@ -433,24 +506,22 @@ async def post_daily_leetcode_solution():
                 break
         
         if not question:
-            logger.error(f'[TASK:{_task_name}] Question ID {today_challenge["question_id"]} not found in JSON')
+            daily_cog = bot.get_cog('LeetCodeDaily')
+            if daily_cog:
+                question = await daily_cog.fetch_question(today_challenge['question_id'])
+        
+        if not question:
+            logger.error(f'[TASK:{_task_name}] Question ID {today_challenge["question_id"]} not found in JSON or problem catalog')
             return
         
-        logger.info(f'[TASK:{_task_name}] Generating solutions for: {question["title"]}')
+        logger.info(f'[TASK:{_task_name}] Loading solutions for: {question["title"]}')
         
-        from utils.groq_api import GroqAPI
         from cogs.leetcodedaily import LanguageSelectView
         
-        groq = GroqAPI()
-        solutions = await groq.generate_multi_language_solutions(
-            question['title'],
-            question['description'],
-            question['difficulty'],
-            question.get('hints', [])
-        )
+        solutions = await bot.solution_store.get_or_generate(question, bot.solution_store.post_languages)
         logger.debug(f'[TASK:{_task_name}] Solutions generated for languages: {list(solutions.keys())}')
         
-        view = LanguageSelectView(question, solutions)
+        view = LanguageSelectView(question)
         python_solution = solutions.get('python', {})
         embeds = view.children[0].create_solution_embeds(question, python_solution, 'python')
         message = await channel.send(
@@ -486,6 +557,97 @@ async def post_daily_leetcode_solution_error(error):
     logger.error(f'[TASK:post_daily_leetcode_solution] Unhandled loop error: {error}', exc_info=error)
 
 
+_solution_pregenerator = None
+
+@tasks.loop(minutes=15)
+async def solution_pregeneration():
+    global _solution_pregenerator
+    _task_name = 'solution_pregeneration'
+    try:
+        if _solution_pregenerator is None:
+            from utils.solution_pregen import SolutionPregenerator
+            _solution_pregenerator = SolutionPregenerator(
+                bot.solution_store,
+                lookahead=int(os.getenv('SOLUTION_PREGEN_LOOKAHEAD', 3)),
+                token_budget=int(os.getenv('SOLUTION_PREGEN_TOKEN_BUDGET', 60000)),
+                # UTC hours, like the times of the scheduled daily tasks
+                hours=SolutionPregenerator.parse_hours(os.getenv('SOLUTION_PREGEN_HOURS', '0-17'))
+            )
+
+        if not _solution_pregenerator.in_window():
+            return
+
+        daily_cog = bot.get_cog('LeetCodeDaily')
+        if not daily_cog:
+            logger.warning(f'[TASK:{_task_name}] LeetCodeDaily cog not loaded')
+            return
+
+        questions = []
+        today_challenge = await bot.db.get_todays_challenge()
+        if today_challenge and not today_challenge['solution_posted']:
+            question = await daily_cog.fetch_question(today_challenge['question_id'])
+            if question:
+                questions.append(question)
+
+        posted_ids = await bot.db.get_posted_question_ids()
+        for question in daily_cog.get_upcoming_questions(posted_ids, _solution_pregenerator.lookahead):
+            if all(question['id'] != q['id'] for q in questions):
+                questions.append(question)
+
+        await _solution_pregenerator.run(questions)
+        _task_metrics[_task_name] = _solution_pregenerator.summary()
+        _task_last_run[_task_name] = datetime.now()
+        logger.debug(f'[TASK:{_task_name}] {_solution_pregenerator.summary()}')
+    except Exception as e:
+        _task_error_counts[_task_name] = _task_error_counts.get(_task_name, 0) + 1
+        logger.error(f'[TASK:{_task_name}] Error: {e}')
+
+@solution_pregeneration.before_loop
+async def before_solution_pregeneration():
+    while True:
+        try:
+            if bot.is_ready():
+                logger.debug('[TASK:solution_pregeneration] Bot ready — loop starting')
+                return
+            await asyncio.sleep(1)
+        except RuntimeError:
+            await asyncio.sleep(1)
+
+@solution_pregeneration.error
+async def solution_pregeneration_error(error):
+    _task_error_counts['solution_pregeneration'] = _task_error_counts.get('solution_pregeneration', 0) + 1
+    logger.error(f'[TASK:solution_pregeneration] Unhandled loop error: {error}', exc_info=error)
+
+
+@tasks.loop(hours=24)
+async def problem_catalog_sync():
+    _task_name = 'problem_catalog_sync'
+    logger.info(f'[TASK:{_task_name}] Starting iteration #{problem_catalog_sync.current_loop}')
+    try:
+        listed, changed = await bot.problem_catalog.sync()
+        logger.info(f'[TASK:{_task_name}] {listed} problem(s) listed, {changed} new or changed, {len(bot.problem_catalog)} in catalog')
+        _task_last_run[_task_name] = datetime.now()
+    except Exception as e:
+        _task_error_counts[_task_name] = _task_error_counts.get(_task_name, 0) + 1
+        logger.error(f'[TASK:{_task_name}] Error: {e}')
+
+@problem_catalog_sync.before_loop
+async def before_problem_catalog_sync():
+    while True:
+        try:
+            if bot.is_ready():
+                logger.debug('[TASK:problem_catalog_sync] Bot ready — loop starting')
+                return
+            await asyncio.sleep(1)
+        except RuntimeError:
+            await asyncio.sleep(1)
+
+@problem_catalog_sync.error
+async def problem_catalog_sync_error(error):
+    _task_error_counts['problem_catalog_sync'] = _task_error_counts.get('problem_catalog_sync', 0) + 1
+    logger.error(f'[TASK:problem_catalog_sync] Unhandled loop error: {error}', exc_info=error)
+
+
 bot = LeetCodeBot()
 
 if __name__ == '__main__':
@@ -0,0 +1,47 @@
+-- Baseline schema. IF NOT EXISTS so databases created before versioned
+-- migrations are adopted as-is.
+
+CREATE TABLE IF NOT EXISTS users (
+    discord_id BIGINT PRIMARY KEY,
+    leetcode_username TEXT NOT NULL,
+    total_solved INTEGER DEFAULT 0,
+    weekly_solved INTEGER DEFAULT 0,
+    last_updated TIMESTAMP,
+    linked_at TIMESTAMP DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS submissions (
+    id SERIAL PRIMARY KEY,
+    discord_id BIGINT REFERENCES users(discord_id) ON DELETE CASCADE,
+    problem_title TEXT,
+    problem_slug TEXT,
+    difficulty TEXT,
+    timestamp BIGINT,
+    week_number INTEGER
+);
+
+CREATE INDEX IF NOT EXISTS idx_submissions_discord_id
+ON submissions(discord_id);
+
+CREATE INDEX IF NOT EXISTS idx_submissions_week
+ON submissions(week_number);
+
+CREATE TABLE IF NOT EXISTS ai_news_assignments (
+    id SERIAL PRIMARY KEY,
+    discord_id BIGINT,
+    assigned_date DATE DEFAULT CURRENT_DATE,
+    completed BOOLEAN DEFAULT FALSE,
+    completed_date TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS daily_challenges (
+    id SERIAL PRIMARY KEY,
+    question_id INTEGER NOT NULL,
+    posted_date DATE DEFAULT CURRENT_DATE,
+    question_message_id BIGINT,
+    solution_message_id BIGINT,
+    solution_posted BOOLEAN DEFAULT FALSE
+);
+
+CREATE INDEX IF NOT EXISTS idx_daily_challenges_date
+ON daily_challenges(posted_date);
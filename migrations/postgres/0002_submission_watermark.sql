@@ -0,0 +1,4 @@
+-- Newest submission timestamp already ingested per user
+
+ALTER TABLE users
+ADD COLUMN IF NOT EXISTS last_submission_ts BIGINT DEFAULT 0;
@@ -0,0 +1,17 @@
+-- Problem metadata cache and catalog
+
+CREATE TABLE IF NOT EXISTS problems (
+    title_slug TEXT PRIMARY KEY,
+    question_id INTEGER,
+    difficulty TEXT NOT NULL,
+    topic_tags TEXT[] DEFAULT '{}',
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+ALTER TABLE problems
+ADD COLUMN IF NOT EXISTS title TEXT,
+ADD COLUMN IF NOT EXISTS description TEXT,
+ADD COLUMN IF NOT EXISTS paid_only BOOLEAN DEFAULT FALSE;
+
+CREATE INDEX IF NOT EXISTS idx_problems_question_id
+ON problems(question_id);
@@ -0,0 +1,18 @@
+-- One row per (user, problem, submission time) so ingestion can use ON CONFLICT
+
+DO $$
+BEGIN
+    IF to_regclass('uq_submissions_user_slug_ts') IS NULL THEN
+        DELETE FROM submissions a
+        USING submissions b
+        WHERE a.id > b.id
+        AND a.discord_id = b.discord_id
+        AND a.problem_slug = b.problem_slug
+        AND a.timestamp = b.timestamp;
+
+        ALTER TABLE submissions
+        ADD CONSTRAINT uq_submissions_user_slug_ts
+        UNIQUE (discord_id, problem_slug, timestamp);
+    END IF;
+END
+$$;
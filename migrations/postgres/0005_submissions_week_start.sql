@@ -0,0 +1,30 @@
+-- Bucket submissions by the Monday of their UTC week instead of the yearless ISO week
+
+ALTER TABLE submissions ADD COLUMN IF NOT EXISTS week_start DATE;
+
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM information_schema.columns
+        WHERE table_schema = current_schema()
+        AND table_name = 'submissions' AND column_name = 'week_number'
+    ) THEN
+        UPDATE submissions
+        SET week_start = date_trunc('week', to_timestamp(timestamp) AT TIME ZONE 'UTC')::date
+        WHERE week_start IS NULL;
+    END IF;
+END
+$$;
+
+DROP INDEX IF EXISTS idx_submissions_week;
+DROP INDEX IF EXISTS idx_submissions_discord_id;
+ALTER TABLE submissions DROP COLUMN IF EXISTS week_number;
+
+CREATE INDEX IF NOT EXISTS idx_submissions_user_week
+ON submissions(discord_id, week_start, timestamp DESC)
+INCLUDE (problem_title, difficulty);
+
+CREATE INDEX IF NOT EXISTS idx_users_weekly_leaderboard
+ON users(weekly_solved DESC)
+INCLUDE (discord_id, leetcode_username)
+WHERE weekly_solved > 0;
@@ -0,0 +1,14 @@
+-- Generated solutions, zlib-compressed, keyed by the model and prompt that produced them
+
+CREATE TABLE IF NOT EXISTS solutions (
+    question_id INTEGER NOT NULL,
+    language TEXT NOT NULL,
+    model TEXT NOT NULL,
+    prompt_hash TEXT NOT NULL,
+    solution_code BYTEA NOT NULL,
+    explanation BYTEA NOT NULL,
+    time_complexity TEXT,
+    space_complexity TEXT,
+    created_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (question_id, language, model, prompt_hash)
+);
@@ -0,0 +1,64 @@
+-- Embedded schema, equivalent to migrations/postgres up to 0005.
+-- Dates and timestamps are ISO strings, topic_tags is a JSON array.
+
+CREATE TABLE IF NOT EXISTS users (
+    discord_id INTEGER PRIMARY KEY,
+    leetcode_username TEXT NOT NULL,
+    total_solved INTEGER DEFAULT 0,
+    weekly_solved INTEGER DEFAULT 0,
+    last_updated TIMESTAMP,
+    linked_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_submission_ts INTEGER DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_users_weekly_leaderboard
+ON users(weekly_solved DESC)
+WHERE weekly_solved > 0;
+
+CREATE TABLE IF NOT EXISTS submissions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    discord_id INTEGER REFERENCES users(discord_id) ON DELETE CASCADE,
+    problem_title TEXT,
+    problem_slug TEXT,
+    difficulty TEXT,
+    timestamp INTEGER,
+    week_start DATE,
+    CONSTRAINT uq_submissions_user_slug_ts UNIQUE (discord_id, problem_slug, timestamp)
+);
+
+CREATE INDEX IF NOT EXISTS idx_submissions_user_week
+ON submissions(discord_id, week_start, timestamp DESC);
+
+CREATE TABLE IF NOT EXISTS ai_news_assignments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    discord_id INTEGER,
+    assigned_date DATE DEFAULT CURRENT_DATE,
+    completed BOOLEAN DEFAULT 0,
+    completed_date TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS daily_challenges (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    question_id INTEGER NOT NULL,
+    posted_date DATE DEFAULT CURRENT_DATE,
+    question_message_id INTEGER,
+    solution_message_id INTEGER,
+    solution_posted BOOLEAN DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_daily_challenges_date
+ON daily_challenges(posted_date);
+
+CREATE TABLE IF NOT EXISTS problems (
+    title_slug TEXT PRIMARY KEY,
+    question_id INTEGER,
+    difficulty TEXT NOT NULL,
+    topic_tags TEXT DEFAULT '[]',
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    title TEXT,
+    description TEXT,
+    paid_only BOOLEAN DEFAULT 0
+);
+
+CREATE INDEX IF NOT EXISTS idx_problems_question_id
+ON problems(question_id);
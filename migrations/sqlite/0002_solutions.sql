@@ -0,0 +1,14 @@
+-- Equivalent to migrations/postgres/0006_solutions.sql
+
+CREATE TABLE IF NOT EXISTS solutions (
+    question_id INTEGER NOT NULL,
+    language TEXT NOT NULL,
+    model TEXT NOT NULL,
+    prompt_hash TEXT NOT NULL,
+    solution_code BLOB NOT NULL,
+    explanation BLOB NOT NULL,
+    time_complexity TEXT,
+    space_complexity TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (question_id, language, model, prompt_hash)
+);
@@ -0,0 +1,47 @@
+from utils.poll_scheduler import PollScheduler
+
+TICK = 300
+
+
+def simulate(users: int, active: int, budget_per_hour: int = None, days: int = 3):
+    """Run the submission_checker loop; the first `active` users change on every poll"""
+    scheduler = PollScheduler(budget_per_hour=budget_per_hour)
+    rows = [{'discord_id': discord_id} for discord_id in range(users)]
+    polls = {discord_id: [] for discord_id in range(users)}
+
+    for now in range(0, days * 86400, TICK):
+        scheduler.sync(rows, now=now)
+        for user in scheduler.pop_due(now=now):
+            discord_id = user['discord_id']
+            polls[discord_id].append(now)
+            scheduler.record(discord_id, discord_id < active, now=now)
+
+    return scheduler, polls
+
+
+def dormant_gaps(polls: dict, active: int) -> list:
+    return [
+        later - earlier
+        for discord_id, times in polls.items() if discord_id >= active
+        for earlier, later in zip(times, times[1:])
+    ]
+
+
+def test_dormant_users_polled_within_max_interval_with_active_users():
+    scheduler, polls = simulate(users=24, active=2)
+    assert max(dormant_gaps(polls, active=2)) <= scheduler.max_interval + 2 * TICK
+
+
+def test_dormant_users_not_starved_when_active_users_exceed_budget():
+    scheduler, polls = simulate(users=24, active=8, budget_per_hour=12)
+    assert max(dormant_gaps(polls, active=8)) <= scheduler.max_interval + 2 * TICK
+
+
+def test_budget_caps_polls_per_hour():
+    _, polls = simulate(users=24, active=8, budget_per_hour=12, days=1)
+    per_hour = {}
+    for times in polls.values():
+        for now in times:
+            if now >= 3600:
+                per_hour[now // 3600] = per_hour.get(now // 3600, 0) + 1
+    assert max(per_hour.values()) <= 12 + 1
@@ -0,0 +1,71 @@
+"""
+Benchmark the submission polling pipeline against the fake LeetCode server.
+
+Runs the same LeetCodeAPI.update_users_batch path submission_checker uses,
+for a synthetic population stored in SQLite (or any DATABASE_URL), and prints
+throughput/latency per pass. The first pass is a cold start (every user changed); later passes show the steady state.
+
+    python -m tools.bench_polling --users 2000 --latency 0.05 --passes 3 --rps 50
+"""
+import argparse
+import asyncio
+import logging
+import os
+import time
+from types import SimpleNamespace
+
+from tools.fake_leetcode_server import add_arguments, from_arguments
+from utils.database import create_database
+from utils.http_client import create_session, close_session
+from utils.leetcode_api import LeetCodeAPI
+from utils.problem_cache import ProblemMetadataCache
+
+
+async def run(args):
+    fake = from_arguments(args)
+    runner = await fake.start(port=args.port)
+    session = create_session('bench', limit_per_host=args.workers * 2, timeout=30)
+    store = create_database(args.database)
+
+    try:
+        await store.init_db()
+        os.environ['LEETCODE_RPS'] = str(args.rps)
+        os.environ['LEETCODE_BURST'] = str(args.rps)
+        api = LeetCodeAPI(session, api_url=f"http://127.0.0.1:{args.port}/graphql")
+        for discord_id, username in enumerate(fake.usernames(), 1):
+            await store.link_user(discord_id, username)
+        bot = SimpleNamespace(db=store, problem_cache=ProblemMetadataCache(store, api))
+
+        for number in range(1, args.passes + 1):
+            before = dict(fake.stats)
+            started = time.monotonic()
+            stats = await api.update_users_batch(bot, await store.get_users_for_refresh(),
+                                                 workers=args.workers)
+            elapsed = time.monotonic() - started
+            requests = fake.stats['requests'] - before['requests']
+            limited = fake.stats['rate_limited'] - before['rate_limited']
+            print(f"pass {number}: {stats.summary()} | upstream requests={requests} "
+                  f"429s={limited} | batch size={api.batch_size.size} | wall={elapsed:.2f}s")
+    finally:
+        await close_session('bench', session)
+        await store.close()
+        await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--passes", type=int, default=2)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rps", type=float, default=20)
+    parser.add_argument("--database", default="sqlite:///:memory:",
+                        help="DATABASE_URL to run against (default: in-memory SQLite)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
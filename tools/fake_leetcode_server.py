@@ -0,0 +1,257 @@
+"""
+Local stand-in for the LeetCode GraphQL endpoint, for tests and load benchmarks.
+
+Serves a synthetic, deterministic population of users and problems and
+answers the queries LeetCodeAPI sends (getUserProfile, getRecentSubmissions,
+getProblemDifficulty, the aliased batch queries and the problem-list query).
+Responses contain a superset of the requested fields, including both the
+aliased and original names used by the problem-list query.
+
+Point the bot at it with LEETCODE_API_URL=http://127.0.0.1:8765/graphql
+
+    python -m tools.fake_leetcode_server --users 5000 --latency 0.05 --error-rate 0.01 --rate-limit 20
+"""
+import argparse
+import asyncio
+import random
+import re
+import time
+import logging
+from aiohttp import web
+
+logger = logging.getLogger('discord')
+
+FIELD_PATTERN = re.compile(
+    r'(?:(\w+)\s*:\s*)?\b(matchedUser|recentAcSubmissionList|question|questionList)\s*\(([^)]*)\)'
+)
+ARG_PATTERN = re.compile(r'(\w+)\s*:\s*(\$\w+|"[^"]*"|-?\d+)')
+
+DIFFICULTIES = ["Easy", "Medium", "Hard"]
+TAGS = ["Array", "String", "Hash Table", "Dynamic Programming", "Math", "Sorting",
+        "Greedy", "Depth-First Search", "Binary Search", "Tree", "Graph", "Two Pointers"]
+
+
+class FakeLeetCode:
+    def __init__(self, users: int = 1000, problems: int = 3000, active_ratio: float = 0.2,
+                 latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 rate_limit: float = 0.0, retry_after: float = 1.0, seed: int = 42):
+        self.user_count = users
+        self.problem_count = problems
+        self.active_ratio = active_ratio
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.seed = seed
+        self.epoch = int(time.time()) - 30 * 24 * 3600
+        self.random = random.Random(seed)
+
+        self.tokens = rate_limit
+        self.updated = time.monotonic()
+        self.stats = {"requests": 0, "rate_limited": 0, "errors": 0, "fields": 0}
+
+    def usernames(self) -> list:
+        return [f"user{idx}" for idx in range(self.user_count)]
+
+    def _problem(self, idx: int) -> dict:
+        rng = random.Random(self.seed * 1_000_003 + idx)
+        return {
+            "questionId": str(idx + 1),
+            "questionFrontendId": str(idx + 1),
+            "title": f"Problem {idx + 1}",
+            "titleSlug": f"problem-{idx + 1}",
+            "difficulty": DIFFICULTIES[idx % 3],
+            "isPaidOnly": idx % 17 == 0,
+            "paidOnly": idx % 17 == 0,
+            "topicTags": [{"name": name, "slug": name.lower().replace(" ", "-")}
+                          for name in rng.sample(TAGS, 2)],
+            "content": None if idx % 17 == 0 else
+                f"<p>Synthetic problem <code>{idx + 1}</code>.</p><pre><strong>Input:</strong> n = {idx}</pre>"
+        }
+
+    def _user(self, username: str):
+        match = re.fullmatch(r"user(\d+)", username or "")
+        if not match or int(match.group(1)) >= self.user_count:
+            return None
+
+        idx = int(match.group(1))
+        rng = random.Random(self.seed * 7919 + idx)
+        active = rng.random() < self.active_ratio
+        period = rng.randint(600, 3 * 3600) if active else rng.randint(7, 90) * 24 * 3600
+        base = rng.randint(0, 800)
+        solved = max(0, (int(time.time()) - self.epoch) // period)
+        return {"idx": idx, "period": period, "base": base, "solved": solved}
+
+    def _matched_user(self, username: str):
+        user = self._user(username)
+        if not user:
+            return None
+
+        total = user["base"] + user["solved"]
+        counts = [total // 2, total // 3, total - total // 2 - total // 3]
+        return {
+            "username": username,
+            "submitStats": {
+                "acSubmissionNum": [{"difficulty": "All", "count": total}] + [
+                    {"difficulty": difficulty, "count": count}
+                    for difficulty, count in zip(DIFFICULTIES, counts)
+                ]
+            }
+        }
+
+    def _recent(self, username: str, limit: int):
+        user = self._user(username)
+        if not user:
+            return None
+
+        submissions = []
+        for k in range(user["solved"], max(0, user["solved"] - limit), -1):
+            problem = self._problem((user["idx"] * 7919 + k) % self.problem_count)
+            submissions.append({
+                "title": problem["title"],
+                "titleSlug": problem["titleSlug"],
+                "timestamp": str(self.epoch + k * user["period"])
+            })
+        return submissions
+
+    def _question_list(self, skip: int, limit: int, filters: dict):
+        indexes = range(self.problem_count)
+        keywords = (filters or {}).get("searchKeywords")
+        if keywords:
+            indexes = [idx for idx in indexes if keywords in str(idx + 1)]
+
+        indexes = list(indexes)
+        page = [self._problem(idx) for idx in indexes[skip:skip + limit]]
+        return {"total": len(indexes), "totalNum": len(indexes), "questions": page, "data": page}
+
+    def _resolve(self, field: str, args: dict, errors: list):
+        if field == "matchedUser":
+            result = self._matched_user(args.get("username"))
+            if result is None:
+                errors.append({"message": "That user does not exist."})
+            return result
+        if field == "recentAcSubmissionList":
+            return self._recent(args.get("username"), int(args.get("limit") or 20))
+        if field == "question":
+            match = re.fullmatch(r"problem-(\d+)", args.get("titleSlug") or "")
+            if not match or not 0 < int(match.group(1)) <= self.problem_count:
+                return None
+            return self._problem(int(match.group(1)) - 1)
+        if field == "questionList":
+            return self._question_list(int(args.get("skip") or 0), int(args.get("limit") or 50),
+                                       args.get("filters"))
+        return None
+
+    def execute(self, query: str, variables: dict) -> dict:
+        data = {}
+        errors = []
+
+        for alias, field, raw_args in FIELD_PATTERN.findall(query):
+            args = {}
+            for name, value in ARG_PATTERN.findall(raw_args):
+                if value.startswith("$"):
+                    args[name] = variables.get(value[1:])
+                elif value.startswith('"'):
+                    args[name] = value[1:-1]
+                else:
+                    args[name] = int(value)
+
+            key = alias or ("problemsetQuestionList" if field == "questionList" else field)
+            data[key] = self._resolve(field, args, errors)
+            self.stats["fields"] += 1
+
+        response = {"data": data}
+        if errors:
+            response["errors"] = errors
+        return response
+
+    def _take_token(self) -> bool:
+        if not self.rate_limit:
+            return True
+
+        now = time.monotonic()
+        self.tokens = min(self.rate_limit, self.tokens + (now - self.updated) * self.rate_limit)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    async def handle_graphql(self, request: web.Request) -> web.Response:
+        self.stats["requests"] += 1
+
+        if not self._take_token():
+            self.stats["rate_limited"] += 1
+            return web.json_response(
+                {"error": "rate limited"},
+                status=429,
+                headers={"Retry-After": str(self.retry_after)}
+            )
+
+        if self.latency or self.jitter:
+            await asyncio.sleep(max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter)))
+
+        if self.random.random() < self.error_rate:
+            self.stats["errors"] += 1
+            return web.json_response({"error": "internal error"}, status=500)
+
+        payload = await request.json()
+        return web.json_response(self.execute(payload.get("query", ""), payload.get("variables") or {}))
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        return web.json_response(self.stats)
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/graphql", self.handle_graphql)
+        app.router.add_get("/stats", self.handle_stats)
+        return app
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> web.AppRunner:
+        runner = web.AppRunner(self.app())
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        logger.info(f"Fake LeetCode GraphQL server on http://{host}:{port}/graphql")
+        return runner
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--problems", type=int, default=3000)
+    parser.add_argument("--active-ratio", type=float, default=0.2)
+    parser.add_argument("--latency", type=float, default=0.0, help="mean response latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="uniform latency jitter in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 500")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="requests/s before answering 429 (0 = off)")
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=42)
+
+
+def from_arguments(args) -> FakeLeetCode:
+    return FakeLeetCode(
+        users=args.users,
+        problems=args.problems,
+        active_ratio=args.active_ratio,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+        retry_after=args.retry_after,
+        seed=args.seed
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    web.run_app(from_arguments(args).app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,264 +1,305 @@
-import asyncpg
 import os
-from datetime import datetime
+import uuid
+import zlib
+from abc import ABC, abstractmethod
+from datetime import date, datetime, timedelta, timezone
 import logging
+from utils.db_metrics import DatabaseMetrics
+from utils.ttl_cache import AsyncTTLCache
 
 logger = logging.getLogger('discord')
 
-class Database:
+
+def week_start(timestamp: int) -> date:
+    """Monday of the UTC week a unix timestamp falls in (weekly_reset also runs on UTC)"""
+    day = datetime.fromtimestamp(timestamp, timezone.utc).date()
+    return day - timedelta(days=day.weekday())
+
+
+def tier_for(weekly_solved: int, tiers: dict = None):
+    """Name of the highest {name: threshold} tier weekly_solved reaches, or None"""
+    reached = [(threshold, name) for name, threshold in (tiers or {}).items()
+               if weekly_solved >= threshold]
+    return max(reached)[1] if reached else None
+
+
+def pack_text(text: str) -> bytes:
+    """zlib-compress text for a BYTEA/BLOB column"""
+    return zlib.compress((text or '').encode('utf-8'))
+
+
+def unpack_text(data: bytes) -> str:
+    return zlib.decompress(bytes(data)).decode('utf-8') if data else ''
+
+
+def unpack_solution(row) -> dict:
+    """Solution dict, in GroqAPI's shape, from a solutions row"""
+    return {
+        'solution_code': unpack_text(row['solution_code']),
+        'explanation': unpack_text(row['explanation']),
+        'time_complexity': row['time_complexity'] or 'N/A',
+        'space_complexity': row['space_complexity'] or 'N/A',
+        'language': row['language']
+    }
+
+
+class UserRecord:
+    """Compact, read-only copy of a users row that still supports user['column']"""
+
+    __slots__ = ('discord_id', 'leetcode_username', 'total_solved', 'weekly_solved',
+                 'last_updated', 'linked_at', 'last_submission_ts')
+
+    COLUMNS = ', '.join(__slots__)
+
+    def __init__(self, row):
+        for name in self.__slots__:
+            object.__setattr__(self, name, row[name])
+
+    def __setattr__(self, name, value):
+        raise AttributeError('UserRecord is read-only')
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def keys(self):
+        return self.__slots__
+
+    def __repr__(self):
+        return f"UserRecord({self.discord_id}, {self.leetcode_username!r})"
+
+
+class Database(ABC):
+    """
+    Storage interface used by the bot. Rows are returned as mappings
+    (row['column']); see PostgresDatabase and SQLiteDatabase.
+
+    In-process caches register a region with register_cache. Implementations
+    call _invalidate(region, keys) after every write, which clears the local
+    caches and, where the backend supports it, tells other processes to do the
+    same. get_user reads through the 'users' region.
+    """
+
     def __init__(self):
-        self.pool = None
-        self.database_url = os.getenv('DATABASE_URL')
-        
-        if not self.database_url:
-            raise ValueError("DATABASE_URL environment variable not set")
-    
+        self.instance_id = uuid.uuid4().hex
+        self.user_cache = AsyncTTLCache(
+            max_size=int(os.getenv('USER_CACHE_SIZE', '4096')),
+            default_ttl=float(os.getenv('USER_CACHE_TTL', '3600')),
+            negative_ttl=300
+        )
+        self.metrics = DatabaseMetrics()
+        self._cache_regions = {}
+        self.register_cache('users', self._drop_cached_users)
+
+    def register_cache(self, region: str, invalidate):
+        """invalidate(keys) is called with a list of changed keys, or None for everything"""
+        self._cache_regions.setdefault(region, []).append(invalidate)
+
+    def _dispatch_invalidation(self, region: str, keys):
+        for invalidate in self._cache_regions.get(region, []):
+            try:
+                invalidate(keys)
+            except Exception as e:
+                logger.error(f'Error invalidating cache region {region}: {e}')
+
+    def _invalidate(self, region: str, keys=None):
+        keys = None if keys is None else list(keys)
+        self._dispatch_invalidation(region, keys)
+        self._publish(region, keys)
+
+    def _publish(self, region: str, keys):
+        """Announce a change to other processes; single-process backends do nothing"""
+
+    def _invalidate_users(self, discord_ids=None):
+        self._invalidate('users', discord_ids)
+
+    def _drop_cached_users(self, discord_ids):
+        if discord_ids is None:
+            self.user_cache.clear()
+            return
+        for discord_id in discord_ids:
+            self.user_cache.invalidate(discord_id)
+
+    @abstractmethod
     async def init_db(self):
-        try:
-            self.pool = await asyncpg.create_pool(
-                self.database_url,
-                min_size=1,
-                max_size=10,
-                command_timeout=60,
-                statement_cache_size=0
-            )
-            
-            logger.info('Database pool created')
-            async with self.pool.acquire() as conn:
-                await conn.execute('''
-                    CREATE TABLE IF NOT EXISTS users (
-                        discord_id BIGINT PRIMARY KEY,
-                        leetcode_username TEXT NOT NULL,
-                        total_solved INTEGER DEFAULT 0,
-                        weekly_solved INTEGER DEFAULT 0,
-                        last_updated TIMESTAMP,
-                        linked_at TIMESTAMP DEFAULT NOW()
-                    )
-                ''')
-                
-                await conn.execute('''
-                    CREATE TABLE IF NOT EXISTS submissions (
-                        id SERIAL PRIMARY KEY,
-                        discord_id BIGINT REFERENCES users(discord_id) ON DELETE CASCADE,
-                        problem_title TEXT,
-                        problem_slug TEXT,
-                        difficulty TEXT,
-                        timestamp BIGINT,
-                        week_number INTEGER
-                    )
-                ''')
-                
-                await conn.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_submissions_discord_id 
-                    ON submissions(discord_id)
-                ''')
-                
-                await conn.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_submissions_week 
-                    ON submissions(week_number)
-                ''')
-                await conn.execute('''
-                    CREATE TABLE IF NOT EXISTS ai_news_assignments (
-                        id SERIAL PRIMARY KEY,
-                        discord_id BIGINT,
-                        assigned_date DATE DEFAULT CURRENT_DATE,
-                        completed BOOLEAN DEFAULT FALSE,
-                        completed_date TIMESTAMP
-                    )
-                ''')
-                await conn.execute('''
-                    CREATE TABLE IF NOT EXISTS daily_challenges (
-                        id SERIAL PRIMARY KEY,
-                        question_id INTEGER NOT NULL,
-                        posted_date DATE DEFAULT CURRENT_DATE,
-                        question_message_id BIGINT,
-                        solution_message_id BIGINT,
-                        solution_posted BOOLEAN DEFAULT FALSE
-                    )
-                ''')
-                
-                await conn.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_daily_challenges_date 
-                    ON daily_challenges(posted_date)
-                ''')
-                
-                logger.info('Database tables created/verified')
-        
-        except Exception as e:
-            logger.error(f'Database initialization error: {e}')
-            raise
-    
+        """Connect and bring the schema up to date"""
+
+    @abstractmethod
     async def close(self):
-        if self.pool:
-            await self.pool.close()
-            logger.info('Database pool closed')
+        pass
+
+    @abstractmethod
+    async def ping(self) -> bool:
+        pass
+
+    @abstractmethod
+    async def list_tables(self) -> list:
+        pass
+
+    def pool_status(self) -> dict:
+        """Connection pool size/idle/max, where the backend has a pool"""
+        return {}
 
+    @abstractmethod
     async def link_user(self, discord_id: int, leetcode_username: str):
-        async with self.pool.acquire() as conn:
-            await conn.execute('''
-                INSERT INTO users (discord_id, leetcode_username, last_updated)
-                VALUES ($1, $2, $3)
-                ON CONFLICT (discord_id) 
-                DO UPDATE SET leetcode_username = $2, last_updated = $3
-            ''', discord_id, leetcode_username, datetime.now())
-    
+        pass
+
     async def get_user(self, discord_id: int):
-        async with self.pool.acquire() as conn:
-            row = await conn.fetchrow(
-                'SELECT * FROM users WHERE discord_id = $1',
-                discord_id
-            )
-            return row
-    
+        """UserRecord for a linked user, or None"""
+        return await self.user_cache.get_or_load(discord_id, lambda: self._load_user(discord_id))
+
+    async def _load_user(self, discord_id: int):
+        row = await self._fetch_user(discord_id)
+        return UserRecord(row) if row else None
+
+    @abstractmethod
+    async def _fetch_user(self, discord_id: int):
+        """Uncached row with the UserRecord columns"""
+
+    @abstractmethod
     async def get_all_users(self):
-        async with self.pool.acquire() as conn:
-            rows = await conn.fetch(
-                'SELECT discord_id, leetcode_username FROM users'
-            )
-            return [(row['discord_id'], row['leetcode_username']) for row in rows]
-    
-    async def update_user_stats(self, discord_id: int, total_solved: int, weekly_solved: int):
-        async with self.pool.acquire() as conn:
-            await conn.execute('''
-                UPDATE users 
-                SET total_solved = $1, weekly_solved = $2, last_updated = $3
-                WHERE discord_id = $4
-            ''', total_solved, weekly_solved, datetime.now(), discord_id)
-    
+        """[(discord_id, leetcode_username)]"""
+
+    @abstractmethod
+    async def get_users_for_refresh(self):
+        """Rows of discord_id, leetcode_username, total_solved, last_submission_ts"""
+
+    @abstractmethod
+    async def touch_users(self, discord_ids: list):
+        pass
+
+    @abstractmethod
     async def unlink_user(self, discord_id: int):
-        async with self.pool.acquire() as conn:
-            await conn.execute('DELETE FROM users WHERE discord_id = $1', discord_id)
-    
-    async def add_submission(self, discord_id: int, problem_title: str, 
-                           problem_slug: str, difficulty: str, timestamp: int):
-        week_number = datetime.fromtimestamp(timestamp).isocalendar()[1]
-        
-        async with self.pool.acquire() as conn:
-            existing = await conn.fetchrow('''
-                SELECT id FROM submissions 
-                WHERE discord_id = $1 AND problem_slug = $2 AND timestamp = $3
-            ''', discord_id, problem_slug, timestamp)
-            
-            if not existing:
-                await conn.execute('''
-                    INSERT INTO submissions 
-                    (discord_id, problem_title, problem_slug, difficulty, timestamp, week_number)
-                    VALUES ($1, $2, $3, $4, $5, $6)
-                ''', discord_id, problem_title, problem_slug, difficulty, timestamp, week_number)
-                return True
-            
-            return False
-    
+        pass
+
+    async def refresh_user(self, discord_id: int, total_solved: int, submissions: list,
+                           last_submission_ts: int = 0):
+        """Number of new submissions recorded by refresh_users, or None if the user is not linked"""
+        inserted = await self.refresh_users([(discord_id, total_solved, submissions, last_submission_ts)])
+        return len(inserted[discord_id]) if discord_id in inserted else None
+
+    @abstractmethod
+    async def refresh_users(self, refreshes: list) -> dict:
+        """
+        Atomically record (discord_id, total_solved, submissions, last_submission_ts)
+        refreshes for one or many users: insert the (problem_title, problem_slug,
+        difficulty, timestamp) submissions, add the new ones to weekly_solved and
+        store total_solved and the watermark.
+
+        Returns {discord_id: [the submission tuples that were actually new]} for
+        every user that is still linked.
+        """
+
+    @abstractmethod
     async def get_user_submissions_this_week(self, discord_id: int):
-        current_week = datetime.now().isocalendar()[1]
-        
-        async with self.pool.acquire() as conn:
-            rows = await conn.fetch('''
-                SELECT problem_title, difficulty, timestamp
-                FROM submissions
-                WHERE discord_id = $1 AND week_number = $2
-                ORDER BY timestamp DESC
-            ''', discord_id, current_week)
-            
-            return [(row['problem_title'], row['difficulty'], row['timestamp']) for row in rows]
-    
+        """[(problem_title, difficulty, timestamp)], newest first"""
+
+    @abstractmethod
     async def get_weekly_leaderboard(self, limit: int = 10):
-        async with self.pool.acquire() as conn:
-            rows = await conn.fetch('''
-                SELECT discord_id, leetcode_username, weekly_solved
-                FROM users
-                WHERE weekly_solved > 0
-                ORDER BY weekly_solved DESC
-                LIMIT $1
-            ''', limit)
-            
-            return [(row['discord_id'], row['leetcode_username'], row['weekly_solved']) 
-                    for row in rows]
-    
-    async def reset_weekly_stats(self):
-        async with self.pool.acquire() as conn:
-            await conn.execute('UPDATE users SET weekly_solved = 0')
-    
+        """[(discord_id, leetcode_username, weekly_solved)]"""
+
+    @abstractmethod
+    async def reset_weekly_stats(self, tiers: dict = None):
+        """
+        Zero every weekly_solved in one operation. Returns (discord_id, old_tier,
+        new_tier) for the users whose tier under {name: threshold} changed.
+        """
+
+    @abstractmethod
     async def get_current_ai_news_assignee(self):
-        async with self.pool.acquire() as conn:
-            row = await conn.fetchrow('''
-                SELECT discord_id, completed
-                FROM ai_news_assignments
-                WHERE assigned_date >= CURRENT_DATE - INTERVAL '7 days'
-                AND completed = FALSE
-                ORDER BY assigned_date DESC
-                LIMIT 1
-            ''')
-            return row
-    
+        pass
+
+    @abstractmethod
     async def set_ai_news_assignee(self, discord_id: int):
-        async with self.pool.acquire() as conn:
-            await conn.execute('''
-                INSERT INTO ai_news_assignments (discord_id, assigned_date)
-                VALUES ($1, CURRENT_DATE)
-            ''', discord_id)
-    
+        pass
+
+    @abstractmethod
     async def mark_ai_news_complete(self, discord_id: int):
-        async with self.pool.acquire() as conn:
-            await conn.execute('''
-                UPDATE ai_news_assignments
-                SET completed = TRUE, completed_date = NOW()
-                WHERE discord_id = $1 
-                AND assigned_date >= CURRENT_DATE - INTERVAL '7 days'
-            ''', discord_id)
-    
+        pass
+
+    @abstractmethod
     async def get_recent_ai_news_assignees(self, weeks: int = 4):
-        async with self.pool.acquire() as conn:
-            rows = await conn.fetch('''
-                SELECT DISTINCT discord_id
-                FROM ai_news_assignments
-                WHERE assigned_date >= CURRENT_DATE - INTERVAL '%s weeks'
-            ''' % weeks)
-            
-            return [row['discord_id'] for row in rows]
-    
+        pass
+
+    @abstractmethod
     async def get_todays_challenge(self):
-        async with self.pool.acquire() as conn:
-            row = await conn.fetchrow('''
-                SELECT * FROM daily_challenges
-                WHERE posted_date = CURRENT_DATE
-            ''')
-            return row
-    
+        pass
+
+    @abstractmethod
     async def post_daily_challenge(self, question_id: int, question_message_id: int):
-        async with self.pool.acquire() as conn:
-            await conn.execute('''
-                INSERT INTO daily_challenges (question_id, posted_date, question_message_id)
-                VALUES ($1, CURRENT_DATE, $2)
-            ''', question_id, question_message_id)
-    
+        pass
+
+    @abstractmethod
     async def post_challenge_solution(self, challenge_id: int, solution_message_id: int):
-        async with self.pool.acquire() as conn:
-            await conn.execute('''
-                UPDATE daily_challenges
-                SET solution_posted = TRUE, solution_message_id = $1
-                WHERE id = $2
-            ''', solution_message_id, challenge_id)
-    
+        pass
+
+    @abstractmethod
     async def get_posted_question_ids(self):
-        async with self.pool.acquire() as conn:
-            rows = await conn.fetch('''
-                SELECT DISTINCT question_id FROM daily_challenges
-            ''')
-            return [row['question_id'] for row in rows]
-    
+        pass
+
+    @abstractmethod
     async def get_challenge_stats(self):
-        async with self.pool.acquire() as conn:
-            total = await conn.fetchval('''
-                SELECT COUNT(*) FROM daily_challenges
-            ''')
-            
-            with_solution = await conn.fetchval('''
-                SELECT COUNT(*) FROM daily_challenges
-                WHERE solution_posted = TRUE
-            ''')
-            
-            return {
-                'total_posted': total or 0,
-                'solutions_posted': with_solution or 0
-            }
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    async def get_problems(self, title_slugs: list):
+        """{title_slug: {title_slug, question_id, difficulty, topic_tags}}"""
+
+    @abstractmethod
+    async def upsert_problems(self, problems: list):
+        pass
+
+    @abstractmethod
+    async def get_catalog_problems(self):
+        pass
+
+    @abstractmethod
+    async def upsert_catalog_problems(self, problems: list):
+        pass
+
+    @abstractmethod
+    async def get_solutions(self, question_id: int, model: str, prompt_hash: str):
+        """
+        {language: {solution_code, explanation, time_complexity, space_complexity, language}}
+        stored for a question under the given model and prompt hash
+        """
+
+    @abstractmethod
+    async def upsert_solutions(self, question_id: int, model: str, prompt_hash: str, solutions: dict):
+        """Store {language: solution dict} as returned by GroqAPI"""
+
+    @abstractmethod
+    async def delete_solutions(self, question_id: int = None, language: str = None) -> int:
+        """Delete stored solutions, optionally for one question and/or language; returns the count"""
+
+
+def create_database(database_url: str = None) -> Database:
+    """
+    Pick the storage backend from DATABASE_URL:
+    postgres://... or postgresql://... for Postgres, sqlite:///path/to/bot.db
+    (or sqlite:///:memory:) for the embedded SQLite backend.
+    """
+    database_url = database_url or os.getenv('DATABASE_URL')
+
+    if not database_url:
+        raise ValueError("DATABASE_URL environment variable not set")
+
+    if database_url.startswith('sqlite:'):
+        from utils.sqlite_database import SQLiteDatabase
+        # sqlite:///relative.db, sqlite:////absolute/path.db
+        path = database_url[len('sqlite:'):]
+        path = path[2:] if path.startswith('//') else path
+        path = path[1:] if path.startswith('/') else path
+        logger.info(f'Using SQLite storage at {path}')
+        return SQLiteDatabase(path or ':memory:')
+
+    if database_url.startswith(('postgres://', 'postgresql://')):
+        from utils.postgres_database import PostgresDatabase
+        return PostgresDatabase(database_url)
+
+    raise ValueError(f"Unsupported DATABASE_URL scheme: {database_url.split(':', 1)[0]}")
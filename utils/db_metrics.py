@@ -0,0 +1,110 @@
+import os
+import logging
+
+logger = logging.getLogger('discord')
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with approximate percentiles"""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        ms = seconds * 1000
+        for idx, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                break
+        else:
+            idx = len(BUCKETS_MS)
+
+        self.counts[idx] += 1
+        self.calls += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def percentile(self, pct: float) -> float:
+        """Upper bound (ms) of the bucket holding the pct-th percentile"""
+        if not self.calls:
+            return 0.0
+
+        rank = pct / 100 * self.calls
+        seen = 0
+        for idx, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return BUCKETS_MS[idx] if idx < len(BUCKETS_MS) else self.max * 1000
+        return self.max * 1000
+
+    @property
+    def average_ms(self) -> float:
+        return self.total / self.calls * 1000 if self.calls else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"n={self.calls} avg={self.average_ms:.1f}ms p50<={self.percentile(50):.0f}ms "
+            f"p95<={self.percentile(95):.0f}ms p99<={self.percentile(99):.0f}ms max={self.max * 1000:.1f}ms"
+        )
+
+
+class DatabaseMetrics:
+    """
+    Pool and query instrumentation: connection acquire wait, connections in
+    use, a latency histogram per query name and a log of queries slower than
+    DB_SLOW_QUERY_MS.
+    """
+
+    def __init__(self, slow_query_ms: float = None):
+        if slow_query_ms is None:
+            slow_query_ms = float(os.getenv('DB_SLOW_QUERY_MS', '500'))
+        self.slow_query_ms = slow_query_ms
+        self.acquire = LatencyHistogram()
+        self.queries = {}
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.slow_queries = 0
+
+    def acquired(self, waited: float):
+        self.acquire.record(waited)
+        self.in_use += 1
+        self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def released(self):
+        self.in_use -= 1
+
+    def record(self, name: str, seconds: float):
+        histogram = self.queries.get(name)
+        if histogram is None:
+            histogram = self.queries[name] = LatencyHistogram()
+        histogram.record(seconds)
+
+        if seconds * 1000 >= self.slow_query_ms:
+            self.slow_queries += 1
+            logger.warning(f'[DB] Slow query {name}: {seconds * 1000:.0f}ms')
+
+    def busiest(self, limit: int = 5) -> list:
+        """(name, histogram) for the `limit` queries with the most total time"""
+        return sorted(self.queries.items(), key=lambda item: item[1].total, reverse=True)[:limit]
+
+    def pool_summary(self) -> str:
+        return (
+            f"in_use={self.in_use} peak={self.peak_in_use} acquire_wait "
+            f"avg={self.acquire.average_ms:.1f}ms p95<={self.acquire.percentile(95):.0f}ms "
+            f"max={self.acquire.max * 1000:.1f}ms slow_queries={self.slow_queries}"
+        )
+
+    def summary(self, limit: int = 5) -> str:
+        if not self.queries:
+            return 'no queries recorded'
+
+        return ' | '.join(
+            f"{name} n={histogram.calls} avg={histogram.average_ms:.1f}ms "
+            f"p95<={histogram.percentile(95):.0f}ms max={histogram.max * 1000:.1f}ms"
+            for name, histogram in self.busiest(limit)
+        )
@@ -1,27 +1,62 @@
 import aiohttp
+import asyncio
+import json
 import os
+import time
 import logging
 
 logger = logging.getLogger('discord')
 
+LANGUAGES = {
+    "python": {"name": "Python", "syntax": "python", "comment": "#"},
+    "javascript": {"name": "JavaScript", "syntax": "javascript", "comment": "//"},
+    "java": {"name": "Java", "syntax": "java", "comment": "//"},
+    "cpp": {"name": "C++", "syntax": "cpp", "comment": "//"},
+    "go": {"name": "Go", "syntax": "go", "comment": "//"}
+}
+
+# Bump whenever a generation prompt changes so stored solutions are regenerated
+PROMPT_VERSION = 1
+
+# "structured": one JSON request for every language, falling back per language;
+# "per_language": one request per language
+GENERATION_MODES = ("structured", "per_language")
+
 class GroqAPI:
     """Groq API integration for generating LeetCode solutions and explanations"""
     
-    def __init__(self):
+    def __init__(self, session: aiohttp.ClientSession):
+        self.session = session
         self.api_key = os.getenv('GROQ_API_KEY')
         self.api_url = "https://api.groq.com/openai/v1/chat/completions"
         self.model = "llama-3.3-70b-versatile"
+        self.concurrency = max(1, int(os.getenv('GROQ_CONCURRENCY', 5)))
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self.tokens_used = 0
+        self.generation_mode = os.getenv('GROQ_GENERATION_MODE', 'structured').lower()
+        if self.generation_mode not in GENERATION_MODES:
+            logger.warning(f"Unknown GROQ_GENERATION_MODE {self.generation_mode!r}, using structured")
+            self.generation_mode = "structured"
         
         if not self.api_key:
             logger.warning("GROQ_API_KEY not set in environment variables")
     
+    def _record_usage(self, data: dict, usage: dict = None):
+        """Add a completion's token usage to the running total and to the caller's `usage`, if given"""
+        tokens = (data.get('usage') or {}).get('total_tokens', 0) or 0
+        self.tokens_used += tokens
+        if usage is not None:
+            usage['total_tokens'] = usage.get('total_tokens', 0) + tokens
+
     async def generate_solution(self, problem_title: str, problem_description: str, 
-                               difficulty: str, hints: list = None, language: str = "python") -> dict:
+                               difficulty: str, hints: list = None, language: str = "python",
+                               usage: dict = None) -> dict:
         """
         Generate a complete solution with explanation for a LeetCode problem in specified language
         
         Args:
             language: "python", "javascript", "java", "cpp", or "go"
+            usage: optional dict whose "total_tokens" is increased by this call's usage
         
         Returns:
             dict with keys: solution_code, explanation, time_complexity, space_complexity, language
@@ -36,15 +71,7 @@ class GroqAPI:
                 "space_complexity": "N/A",
                 "language": language
             }
-        lang_config = {
-            "python": {"name": "Python", "syntax": "python", "comment": "#"},
-            "javascript": {"name": "JavaScript", "syntax": "javascript", "comment": "//"},
-            "java": {"name": "Java", "syntax": "java", "comment": "//"},
-            "cpp": {"name": "C++", "syntax": "cpp", "comment": "//"},
-            "go": {"name": "Go", "syntax": "go", "comment": "//"}
-        }
-        
-        lang_info = lang_config.get(language, lang_config["python"])
+        lang_info = LANGUAGES.get(language, LANGUAGES["python"])
         hints_text = "\n".join([f"- {hint}" for hint in hints]) if hints else "No hints provided"
         
         prompt = f"""You are a LeetCode expert. Provide a complete solution for this problem in {lang_info['name']}.
@@ -76,51 +103,51 @@ Format your response EXACTLY like this:
 Be concise but thorough. Focus on the optimal solution. Use proper {lang_info['name']} syntax and conventions."""
 
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                }
+            headers = {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            }
                 
-                payload = {
-                    "model": self.model,
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": "You are a helpful coding assistant specializing in LeetCode problems. Provide clean, optimal solutions with clear explanations."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    "temperature": 0.3, 
-                    "max_tokens": 2000
-                }
+            payload = {
+                "model": self.model,
+                "messages": [
+                    {
+                        "role": "system",
+                        "content": "You are a helpful coding assistant specializing in LeetCode problems. Provide clean, optimal solutions with clear explanations."
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                "temperature": 0.3, 
+                "max_tokens": 2000
+            }
                 
-                async with session.post(
-                    self.api_url,
-                    headers=headers,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=30)
-                ) as response:
+            async with self.session.post(
+                self.api_url,
+                headers=headers,
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=30)
+            ) as response:
                     
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(f"Groq API error: {response.status} - {error_text}")
-                        return {
-                            "error": f"API error: {response.status}",
-                            "solution_code": "# Error generating solution",
-                            "explanation": error_text,
-                            "time_complexity": "N/A",
-                            "space_complexity": "N/A"
-                        }
+                if response.status != 200:
+                    error_text = await response.text()
+                    logger.error(f"Groq API error: {response.status} - {error_text}")
+                    return {
+                        "error": f"API error: {response.status}",
+                        "solution_code": "# Error generating solution",
+                        "explanation": error_text,
+                        "time_complexity": "N/A",
+                        "space_complexity": "N/A"
+                    }
                     
-                    data = await response.json()
-                    content = data['choices'][0]['message']['content']
-                    result = self._parse_solution_response(content)
-                    result['language'] = language
-                    return result
+                data = await response.json()
+                self._record_usage(data, usage)
+                content = data['choices'][0]['message']['content']
+                result = self._parse_solution_response(content)
+                result['language'] = language
+                return result
                     
         except Exception as e:
             logger.error(f"Error generating solution: {e}")
@@ -134,29 +161,209 @@ Be concise but thorough. Focus on the optimal solution. Use proper {lang_info['n
             }
     
     async def generate_multi_language_solutions(self, problem_title: str, problem_description: str,
-                                               difficulty: str, hints: list = None) -> dict:
+                                               difficulty: str, hints: list = None, mode: str = None,
+                                               languages: list = None, usage: dict = None) -> dict:
         """
         Generate solutions in multiple languages
         
+        Args:
+            mode: "structured" or "per_language", defaults to GROQ_GENERATION_MODE
+            languages: subset of LANGUAGES to generate, defaults to all of them
+            usage: optional dict whose "total_tokens" is increased by the tokens these requests used
+        
         Returns:
-            dict with keys for each language: python, javascript, java, cpp, go
+            dict with keys for each requested language: python, javascript, java, cpp, go
             Each containing: solution_code, explanation, time_complexity, space_complexity, language
+            A language whose request failed carries an "error" key instead of being dropped.
         """
         
-        languages = ["python", "javascript", "java", "cpp", "go"]
+        languages = [lang for lang in (languages or LANGUAGES) if lang in LANGUAGES]
+        mode = mode or self.generation_mode
         solutions = {}
-        
-        for lang in languages:
-            logger.info(f"Generating {lang} solution for {problem_title}")
-            solution = await self.generate_solution(
-                problem_title,
-                problem_description,
-                difficulty,
-                hints,
-                language=lang
+        started = time.monotonic()
+
+        if mode == "structured":
+            solutions = await self.generate_structured_solutions(
+                problem_title, problem_description, difficulty, hints, languages, usage
             )
+
+        missing = [lang for lang in languages if lang not in solutions]
+        if missing:
+            if mode == "structured":
+                logger.info(f"Falling back to per-language generation for {', '.join(missing)}")
+            solutions.update(await self._generate_per_language(
+                problem_title, problem_description, difficulty, hints, missing, usage
+            ))
+
+        failed = [lang for lang in languages if 'error' in solutions[lang]]
+        logger.info(
+            f"Generated {len(languages) - len(failed)}/{len(languages)} solutions for {problem_title} "
+            f"in {time.monotonic() - started:.1f}s ({mode})" + (f" (failed: {', '.join(failed)})" if failed else "")
+        )
+
+        return {lang: solutions[lang] for lang in languages}
+
+    async def _generate_per_language(self, problem_title: str, problem_description: str,
+                                     difficulty: str, hints: list, languages: list,
+                                     usage: dict = None) -> dict:
+        """One generate_solution request per language, at most GROQ_CONCURRENCY at a time"""
+
+        solutions = {}
+
+        async def generate(lang):
+            async with self._semaphore:
+                logger.info(f"Generating {lang} solution for {problem_title}")
+                try:
+                    solution = await self.generate_solution(
+                        problem_title,
+                        problem_description,
+                        difficulty,
+                        hints,
+                        language=lang,
+                        usage=usage
+                    )
+                except Exception as e:
+                    logger.error(f"Error generating {lang} solution: {e}")
+                    solution = {
+                        "error": str(e),
+                        "solution_code": f"{LANGUAGES[lang]['comment']} Error generating solution",
+                        "explanation": f"Failed to generate solution: {str(e)}",
+                        "time_complexity": "N/A",
+                        "space_complexity": "N/A",
+                        "language": lang
+                    }
+                return lang, solution
+
+        for finished in asyncio.as_completed([generate(lang) for lang in languages]):
+            lang, solution = await finished
             solutions[lang] = solution
-        
+
+        return solutions
+
+    async def generate_structured_solutions(self, problem_title: str, problem_description: str,
+                                            difficulty: str, hints: list = None,
+                                            languages: list = None, usage: dict = None) -> dict:
+        """
+        Generate every language in a single JSON-mode request with one shared
+        explanation and complexity analysis.
+
+        Returns:
+            {language: solution dict} for the languages that came back valid;
+            missing languages are left for the caller to retry individually.
+        """
+
+        if not self.api_key:
+            return {}
+
+        languages = languages or list(LANGUAGES)
+        hints_text = "\n".join([f"- {hint}" for hint in hints]) if hints else "No hints provided"
+        code_fields = ",\n".join(
+            f'    "{lang}": "complete {LANGUAGES[lang]["name"]} solution with comments"' for lang in languages
+        )
+
+        prompt = f"""You are a LeetCode expert. Provide the optimal solution for this problem in {', '.join(LANGUAGES[lang]['name'] for lang in languages)}.
+
+**Problem:** {problem_title}
+**Difficulty:** {difficulty}
+**Description:** {problem_description}
+**Hints:** 
+{hints_text}
+
+Respond with a single JSON object and nothing else, using EXACTLY this shape:
+
+{{
+  "explanation": "clear, language-agnostic explanation of the approach",
+  "time_complexity": "O(...)",
+  "space_complexity": "O(...)",
+  "solutions": {{
+{code_fields}
+  }}
+}}
+
+Every solution must implement the same approach using proper conventions for its language. Put only source code in the solution strings, without markdown fences."""
+
+        try:
+            headers = {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            }
+
+            payload = {
+                "model": self.model,
+                "messages": [
+                    {
+                        "role": "system",
+                        "content": "You are a helpful coding assistant specializing in LeetCode problems. You always answer with valid JSON."
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                "response_format": {"type": "json_object"},
+                "temperature": 0.3,
+                "max_tokens": 1000 + 1000 * len(languages)
+            }
+
+            async with self._semaphore:
+                async with self.session.post(
+                    self.api_url,
+                    headers=headers,
+                    json=payload,
+                    timeout=aiohttp.ClientTimeout(total=60)
+                ) as response:
+
+                    if response.status != 200:
+                        error_text = await response.text()
+                        logger.error(f"Groq API error (structured): {response.status} - {error_text}")
+                        return {}
+
+                    data = await response.json()
+                    self._record_usage(data, usage)
+                    content = data['choices'][0]['message']['content']
+
+        except Exception as e:
+            logger.error(f"Error generating structured solutions: {e}")
+            return {}
+
+        return self._parse_structured_response(content, languages)
+
+    def _parse_structured_response(self, content: str, languages: list) -> dict:
+        """Validate a structured response; only well-formed languages are returned"""
+
+        try:
+            data = json.loads(content)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Structured solution response is not valid JSON: {e}")
+            return {}
+
+        if not isinstance(data, dict) or not isinstance(data.get('solutions'), dict):
+            logger.warning("Structured solution response is missing the solutions object")
+            return {}
+
+        shared = {}
+        for field in ("explanation", "time_complexity", "space_complexity"):
+            value = data.get(field)
+            if not isinstance(value, str) or not value.strip():
+                logger.warning(f"Structured solution response is missing {field}")
+                return {}
+            shared[field] = value.strip()
+
+        solutions = {}
+        for lang in languages:
+            code = data['solutions'].get(lang)
+            if not isinstance(code, str) or not code.strip():
+                continue
+
+            code = code.strip()
+            if code.startswith("```"):
+                code = code.split("\n", 1)[1] if "\n" in code else ""
+                code = code.rsplit("```", 1)[0].strip()
+            if not code:
+                continue
+
+            solutions[lang] = {"solution_code": code, **shared, "language": lang}
+
         return solutions
     
     def _parse_solution_response(self, content: str) -> dict:
@@ -229,45 +436,45 @@ Format:
 3. [Third hint]"""
 
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = {
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                }
+            headers = {
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            }
                 
-                payload = {
-                    "model": self.model,
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    "temperature": 0.7,
-                    "max_tokens": 500
-                }
-                async with session.post(
-                    self.api_url,
-                    headers=headers,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=15)
-                ) as response:
+            payload = {
+                "model": self.model,
+                "messages": [
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                "temperature": 0.7,
+                "max_tokens": 500
+            }
+            async with self.session.post(
+                self.api_url,
+                headers=headers,
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=15)
+            ) as response:
                     
-                    if response.status == 200:
-                        data = await response.json()
-                        content = data['choices'][0]['message']['content']
-                        hints = []
-                        for line in content.split('\n'):
-                            line = line.strip()
-                            if line and (line[0].isdigit() or line.startswith('-')):
-                                hint = line.split('.', 1)[-1].strip()
-                                if hint:
-                                    hints.append(hint)
+                if response.status == 200:
+                    data = await response.json()
+                    self._record_usage(data)
+                    content = data['choices'][0]['message']['content']
+                    hints = []
+                    for line in content.split('\n'):
+                        line = line.strip()
+                        if line and (line[0].isdigit() or line.startswith('-')):
+                            hint = line.split('.', 1)[-1].strip()
+                            if hint:
+                                hints.append(hint)
                         
-                        return hints[:num_hints]
-                    else:
-                        logger.error(f"Error generating hints: {response.status}")
-                        return ["Unable to generate hints"]
+                    return hints[:num_hints]
+                else:
+                    logger.error(f"Error generating hints: {response.status}")
+                    return ["Unable to generate hints"]
                         
         except Exception as e:
             logger.error(f"Error generating hints: {e}")
@@ -0,0 +1,34 @@
+import aiohttp
+import logging
+
+logger = logging.getLogger('discord')
+
+
+def create_session(name: str, limit_per_host: int = 10, timeout: float = 30,
+                   headers: dict = None) -> aiohttp.ClientSession:
+    """Create a long-lived pooled session for a single upstream.
+
+    The connector keeps connections alive between requests and caches DNS
+    lookups, so repeated calls to the same host reuse one TCP+TLS handshake.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=limit_per_host,
+        limit_per_host=limit_per_host,
+        ttl_dns_cache=300,
+        keepalive_timeout=60,
+        enable_cleanup_closed=True
+    )
+
+    session = aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=timeout),
+        headers=headers
+    )
+    logger.info(f'HTTP session created for {name} (limit_per_host={limit_per_host})')
+    return session
+
+
+async def close_session(name: str, session: aiohttp.ClientSession):
+    if session and not session.closed:
+        await session.close()
+        logger.info(f'HTTP session closed for {name}')
@@ -1,14 +1,120 @@
 import aiohttp
+import asyncio
+import json
+import os
+from collections import deque
 from datetime import datetime, timedelta
 import logging
+from utils.rate_limit import TokenBucket, CircuitBreaker, CircuitOpenError, parse_retry_after
+from utils.refresh_engine import RefreshEngine
+from utils.single_flight import SingleFlight
+from utils.ttl_cache import AsyncTTLCache
 
 logger = logging.getLogger('discord')
 
+class LeetCodeAPIError(Exception):
+    """Raised when LeetCode does not return a usable GraphQL response"""
+
+class AdaptiveBatchSize:
+    """Additive-increase / multiplicative-decrease sizing for batched queries"""
+
+    def __init__(self, initial: int = 10, minimum: int = 1, maximum: int = 50,
+                 target_bytes: int = 256 * 1024):
+        self.size = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_bytes = target_bytes
+
+    def on_success(self, batch_len: int, response_bytes: int):
+        if response_bytes > self.target_bytes:
+            scaled = int(batch_len * self.target_bytes / response_bytes)
+            self.size = max(self.minimum, min(self.size, scaled))
+        elif batch_len >= self.size:
+            self.size = min(self.maximum, self.size + 2)
+
+    def on_error(self):
+        self.size = max(self.minimum, self.size // 2)
+
 class LeetCodeAPI:
-    def __init__(self):
-        self.api_url = "https://leetcode.com/graphql"
+    def __init__(self, session: aiohttp.ClientSession, api_url: str = None):
+        self.session = session
+        self.api_url = api_url or os.getenv('LEETCODE_API_URL', "https://leetcode.com/graphql")
+        self.batch_size = AdaptiveBatchSize()
+        self.workers = int(os.getenv('LEETCODE_WORKERS', 4))
+        self.max_retries = 3
+        self.bucket = TokenBucket(
+            rate=float(os.getenv('LEETCODE_RPS', 2)),
+            capacity=float(os.getenv('LEETCODE_BURST', 4))
+        )
+        self.breaker = CircuitBreaker('leetcode', failure_threshold=5, reset_timeout=300)
+        self._flights = SingleFlight()
+        self.cache_ttls = {'stats': 60, 'recent': 60}
+        self.cache = AsyncTTLCache(max_size=2048, default_ttl=60, negative_ttl=300)
+
+    async def _post_sized(self, query: str, variables: dict):
+        if not self.breaker.allow():
+            raise CircuitOpenError("LeetCode API circuit is open")
+
+        for attempt in range(self.max_retries + 1):
+            await self.bucket.acquire()
+
+            try:
+                async with self.session.post(
+                    self.api_url,
+                    json={"query": query, "variables": variables},
+                    timeout=aiohttp.ClientTimeout(total=10)
+                ) as response:
+                    if response.status == 429:
+                        retry_after = parse_retry_after(
+                            response.headers.get("Retry-After"),
+                            default=2 ** (attempt + 1)
+                        )
+                        logger.warning(f"LeetCode rate limited (429), backing off {retry_after:.1f}s")
+                        self.bucket.pause(retry_after)
+                        continue
+
+                    if response.status >= 500:
+                        self.breaker.record_failure()
+                        return None, 0
+
+                    if response.status != 200:
+                        # Other 4xx say nothing about LeetCode's health either way
+                        self.breaker.record_neutral()
+                        logger.warning(f"LeetCode request rejected with status {response.status}")
+                        return None, 0
+
+                    self.breaker.record_success()
+                    body = await response.read()
+                    return json.loads(body), len(body)
+
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                self.breaker.record_failure()
+                raise
+
+        self.breaker.record_failure()
+        return None, 0
+
+    async def _post(self, query: str, variables: dict):
+        data, _ = await self._post_sized(query, variables)
+        return data
+
+    async def get_user_stats(self, username: str, fresh: bool = False):
+        """Cached profile stats; fresh=True skips the cache (and refills it) for ingestion"""
+        try:
+            if fresh:
+                stats = await self._fetch_user_stats(username)
+                self.cache.set(('stats', username.lower()), stats, ttl=self.cache_ttls['stats'])
+                return stats
+            return await self.cache.get_or_load(
+                ('stats', username.lower()),
+                lambda: self._fetch_user_stats(username),
+                ttl=self.cache_ttls['stats']
+            )
+        except Exception as e:
+            logger.error(f"Error fetching user stats for {username}: {e}")
+            return None
 
-    async def get_user_stats(self, username: str):
+    async def _fetch_user_stats(self, username: str):
         query = """
         query getUserProfile($username: String!) {
             matchedUser(username: $username) {
@@ -24,23 +130,30 @@ class LeetCodeAPI:
         """
         variables = {"username": username}
 
+        data = await self._post(query, variables)
+        if not data or "data" not in data:
+            raise LeetCodeAPIError("profile request failed")
+        if data["data"] and data["data"].get("matchedUser"):
+            return data["data"]["matchedUser"]
+        return None
+
+    async def get_recent_submissions(self, username: str, limit: int = 20, fresh: bool = False):
+        """Cached recent accepted submissions; fresh=True skips the cache (and refills it)"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.api_url,
-                    json={"query": query, "variables": variables},
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data.get("data") and data["data"].get("matchedUser"):
-                            return data["data"]["matchedUser"]
-            return None
+            if fresh:
+                submissions = await self._fetch_recent_submissions(username, limit)
+                self.cache.set(('recent', username.lower(), limit), submissions, ttl=self.cache_ttls['recent'])
+                return submissions
+            return await self.cache.get_or_load(
+                ('recent', username.lower(), limit),
+                lambda: self._fetch_recent_submissions(username, limit),
+                ttl=self.cache_ttls['recent']
+            )
         except Exception as e:
-            logger.error(f"Error fetching user stats for {username}: {e}")
-            return None
+            logger.error(f"Error fetching submissions for {username}: {e}")
+            return []
 
-    async def get_recent_submissions(self, username: str, limit: int = 20):
+    async def _fetch_recent_submissions(self, username: str, limit: int = 20):
         query = """
         query getRecentSubmissions($username: String!, $limit: Int!) {
             recentAcSubmissionList(username: $username, limit: $limit) {
@@ -53,48 +166,167 @@ class LeetCodeAPI:
 
         variables = {"username": username, "limit": limit}
 
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.api_url,
-                    json={"query": query, "variables": variables},
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data.get("data") and data["data"].get("recentAcSubmissionList"):
-                            return data["data"]["recentAcSubmissionList"]
-            return []
-        except Exception as e:
-            logger.error(f"Error fetching submissions for {username}: {e}")
-            return []
+        data = await self._post(query, variables)
+        if not data or "data" not in data:
+            raise LeetCodeAPIError("submissions request failed")
+        if data["data"] and data["data"].get("recentAcSubmissionList"):
+            return data["data"]["recentAcSubmissionList"]
+        return []
 
-    async def get_problem_difficulty(self, title_slug: str):
-        query = """
-        query getProblemDifficulty($titleSlug: String!) {
-            question(titleSlug: $titleSlug) {
+    async def get_problems_metadata(self, title_slugs: list, chunk_size: int = 50):
+        """
+        Fetch difficulty, question id and topic tags for many problems,
+        using one aliased question() lookup per slug and chunk_size slugs per request.
+
+        Returns:
+            dict mapping title_slug -> {title_slug, question_id, difficulty, topic_tags}
+        """
+        problems = {}
+
+        for start in range(0, len(title_slugs), chunk_size):
+            chunk = title_slugs[start:start + chunk_size]
+            params = []
+            fields = []
+            variables = {}
+
+            for idx, slug in enumerate(chunk):
+                params.append(f"$p{idx}: String!")
+                variables[f"p{idx}"] = slug
+                fields.append(f"""
+            q{idx}: question(titleSlug: $p{idx}) {{
+                questionFrontendId
+                titleSlug
                 difficulty
+                topicTags {{
+                    name
+                }}
+            }}""")
+
+            query = f"query getProblemsMetadata({', '.join(params)}) {{{''.join(fields)}\n        }}"
+
+            try:
+                data = await self._post(query, variables)
+                if not data or not data.get("data"):
+                    continue
+
+                for idx, slug in enumerate(chunk):
+                    question = data["data"].get(f"q{idx}")
+                    if not question:
+                        continue
+
+                    problems[slug] = {
+                        "title_slug": slug,
+                        "question_id": int(question["questionFrontendId"]) if question.get("questionFrontendId") else None,
+                        "difficulty": question.get("difficulty") or "Unknown",
+                        "topic_tags": [tag["name"] for tag in question.get("topicTags") or []]
+                    }
+            except Exception as e:
+                logger.error(f"Error fetching metadata for {len(chunk)} problems: {e}")
+
+        return problems
+
+    async def get_problem_list_page(self, skip: int = 0, limit: int = 100, search: str = None):
+        """
+        Fetch one page of the public problem list.
+
+        Returns:
+            (total, questions) where each question has questionFrontendId, title,
+            titleSlug, difficulty, paidOnly and topicTags. Returns (0, []) on failure.
+        """
+        query = """
+        query problemsetQuestionList($categorySlug: String, $limit: Int, $skip: Int, $filters: QuestionListFilterInput) {
+            problemsetQuestionList: questionList(categorySlug: $categorySlug, limit: $limit, skip: $skip, filters: $filters) {
+                total: totalNum
+                questions: data {
+                    questionFrontendId
+                    title
+                    titleSlug
+                    difficulty
+                    paidOnly: isPaidOnly
+                    topicTags {
+                        name
+                    }
+                }
             }
         }
         """
 
-        variables = {"titleSlug": title_slug}
+        filters = {"searchKeywords": search} if search else {}
+        variables = {"categorySlug": "", "skip": skip, "limit": limit, "filters": filters}
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.api_url,
-                    json={"query": query, "variables": variables},
-                    timeout=aiohttp.ClientTimeout(total=10)
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if data.get("data") and data["data"].get("question"):
-                            return data["data"]["question"]["difficulty"]
-            return "Unknown"
+            data = await self._post(query, variables)
+            if data and data.get("data") and data["data"].get("problemsetQuestionList"):
+                page = data["data"]["problemsetQuestionList"]
+                return page.get("total") or 0, page.get("questions") or []
+            return 0, []
+        except Exception as e:
+            logger.error(f"Error fetching problem list (skip={skip}): {e}")
+            return 0, []
+
+    async def get_problem_contents(self, title_slugs: list):
+        """
+        Fetch the HTML description of several problems in one request.
+
+        Returns:
+            dict mapping title_slug -> HTML content (None for paid-only problems)
+        """
+        params = []
+        fields = []
+        variables = {}
+
+        for idx, slug in enumerate(title_slugs):
+            params.append(f"$p{idx}: String!")
+            variables[f"p{idx}"] = slug
+            fields.append(f"""
+            q{idx}: question(titleSlug: $p{idx}) {{
+                content
+            }}""")
+
+        query = f"query getProblemContents({', '.join(params)}) {{{''.join(fields)}\n        }}"
+
+        try:
+            data = await self._post(query, variables)
+            if not data or not data.get("data"):
+                return {}
+
+            return {
+                slug: (data["data"].get(f"q{idx}") or {}).get("content")
+                for idx, slug in enumerate(title_slugs)
+            }
         except Exception as e:
-            logger.error(f"Error fetching difficulty for {title_slug}: {e}")
-            return "Unknown"
+            logger.error(f"Error fetching content for {len(title_slugs)} problems: {e}")
+            return {}
+
+    async def get_problem_by_number(self, number: int):
+        """
+        Look up a single problem by its frontend number directly from LeetCode.
+        Prefer ProblemCatalog.fetch_by_number, which answers from the local catalog.
+
+        Returns:
+            dict with keys: id, title, title_slug, difficulty, topic_tags, paid_only,
+            description (raw HTML), leetcode_url; or None if not found
+        """
+        _, questions = await self.get_problem_list_page(0, 20, search=str(number))
+
+        for question in questions:
+            if str(question.get("questionFrontendId")) != str(number):
+                continue
+
+            slug = question["titleSlug"]
+            contents = await self.get_problem_contents([slug])
+            return {
+                "id": number,
+                "title": question["title"],
+                "title_slug": slug,
+                "difficulty": question.get("difficulty") or "Unknown",
+                "topic_tags": [tag["name"] for tag in question.get("topicTags") or []],
+                "paid_only": bool(question.get("paidOnly")),
+                "description": contents.get(slug) or "",
+                "leetcode_url": f"https://leetcode.com/problems/{slug}/"
+            }
+
+        return None
 
     def get_total_solved(self, user_stats):
         if not user_stats or "submitStats" not in user_stats:
@@ -106,61 +338,317 @@ class LeetCodeAPI:
                 return stat["count"]
         return 0
         
-    async def update_user(self, bot, discord_id: int, leetcode_username: str):
-        try:
-            user_stats = await self.get_user_stats(leetcode_username)
+    async def get_users_batch(self, usernames: list, limit: int = 20,
+                              include_stats: bool = True, include_recent: bool = True):
+        """
+        Fetch profile stats and/or recent accepted submissions for several users
+        in a single GraphQL request, using aliased fields per username.
 
-            if not user_stats:
-                logger.warning(f"Could not fetch stats for {leetcode_username}")
-                return False
+        Returns:
+            dict mapping username -> {"stats": matchedUser or None, "recent": list},
+            plus the response size in bytes. Returns (None, 0) if the request failed.
+        """
+        params = ["$limit: Int!"] if include_recent else []
+        fields = []
+        variables = {"limit": limit} if include_recent else {}
+
+        for idx, username in enumerate(usernames):
+            params.append(f"$u{idx}: String!")
+            variables[f"u{idx}"] = username
+            if include_stats:
+                fields.append(f"""
+            s{idx}: matchedUser(username: $u{idx}) {{
+                username
+                submitStats {{
+                    acSubmissionNum {{
+                        difficulty
+                        count
+                    }}
+                }}
+            }}""")
+            if include_recent:
+                fields.append(f"""
+            r{idx}: recentAcSubmissionList(username: $u{idx}, limit: $limit) {{
+                title
+                titleSlug
+                timestamp
+            }}""")
 
-            total_solved = self.get_total_solved(user_stats)
-            recent_submissions = await self.get_recent_submissions(leetcode_username, 20)
+        query = f"query getUsersBatch({', '.join(params)}) {{{''.join(fields)}\n        }}"
 
-            week_ago = datetime.now() - timedelta(days=7)
-            weekly_count = 0
+        data, size = await self._post_sized(query, variables)
+        if not data or data.get("data") is None:
+            return None, size
 
-            for submission in recent_submissions:
-                submission_time = datetime.fromtimestamp(int(submission["timestamp"]))
+        results = {}
+        for idx, username in enumerate(usernames):
+            results[username] = {
+                "stats": data["data"].get(f"s{idx}"),
+                "recent": data["data"].get(f"r{idx}") or []
+            }
+        return results, size
 
-                if submission_time >= week_ago:
-                    difficulty = await self.get_problem_difficulty(
-                        submission["titleSlug"]
-                    )
+    async def update_users_batch(self, bot, users: list, workers: int = None, on_polled=None):
+        """
+        Refresh many linked users with batched GraphQL requests.
 
-                    is_new = await bot.db.add_submission(
-                        discord_id,
-                        submission["title"],
-                        submission["titleSlug"],
-                        difficulty,
-                        int(submission["timestamp"])
-                    )
+        `users` are rows with discord_id, leetcode_username, total_solved and
+        last_submission_ts. Each batch first fetches only profile stats; recent
+        submissions are fetched only for usernames whose solved count moved past
+        the stored watermark, so idle users cost one aliased field and no writes
+        beyond a bulk last_updated touch.
 
-                    if is_new:
-                        weekly_count += 1
+        Usernames linked by several Discord accounts are fetched once. Batches
+        are processed by a bounded worker pool; the request rate is limited by
+        the shared token bucket. The batch size grows while responses stay
+        small and halves on failures. If the circuit breaker opens, the
+        remaining users are skipped until the next iteration.
 
-            user = await bot.db.get_user(discord_id)
+        `on_polled(discord_id, changed)` is called for every account refreshed
+        successfully, so a scheduler can adapt that user's polling cadence.
+
+        Returns:
+            RefreshStats with per-account success/failure/skipped counts and request latencies
+        """
+        accounts = {}
+        for user in users:
+            username = user['leetcode_username']
+            accounts.setdefault(username.lower(), (username, []))[1].append(user)
+
+        pending = deque(accounts.values())
+
+        def next_batch():
+            if not pending:
+                return None
+            return [pending.popleft() for _ in range(min(self.batch_size.size, len(pending)))]
 
-            if user:
-                current_weekly = user["weekly_solved"]
-                new_weekly = current_weekly + weekly_count
-                await bot.db.update_user_stats(
-                    discord_id,
-                    total_solved,
-                    new_weekly
+        async def handle(batch):
+            try:
+                results, size = await self.get_users_batch(
+                    [username for username, _ in batch],
+                    include_recent=False
                 )
-            else:
-                await bot.db.update_user_stats(
-                    discord_id,
-                    total_solved,
-                    weekly_count
+            except CircuitOpenError:
+                skipped = batch + list(pending)
+                pending.clear()
+                logger.warning(f"LeetCode circuit open, skipping {len(skipped)} user(s) this iteration")
+                return 0, 0, sum(len(linked) for _, linked in skipped)
+            except Exception as e:
+                logger.error(f"Error fetching batch of {len(batch)} users: {e}")
+                results, size = None, 0
+
+            if results is None:
+                if len(batch) > 1:
+                    self.batch_size.on_error()
+                    logger.warning(f"Batch of {len(batch)} failed, retrying with size {self.batch_size.size}")
+                    pending.extendleft(reversed(batch))
+                    return 0, 0, 0
+
+                username, linked = batch[0]
+                logger.warning(f"Could not fetch stats for {username}")
+                return 0, len(linked), 0
+
+            self.batch_size.on_success(len(batch), size)
+
+            updated = 0
+            failed = 0
+            unchanged_ids = []
+            changed = []
+
+            for username, linked in batch:
+                stats = results[username]["stats"]
+                if not stats:
+                    logger.warning(f"Could not fetch stats for {username}")
+                    failed += len(linked)
+                    continue
+
+                self.cache.set(('stats', username.lower()), stats, ttl=self.cache_ttls['stats'])
+                total_solved = self.get_total_solved(stats)
+                if all(user['total_solved'] == total_solved for user in linked):
+                    unchanged_ids.extend(user['discord_id'] for user in linked)
+                else:
+                    self.cache.invalidate_prefix(('recent', username.lower()))
+                    changed.append((username, linked, stats))
+
+            if unchanged_ids:
+                await bot.db.touch_users(unchanged_ids)
+                updated += len(unchanged_ids)
+                if on_polled:
+                    for discord_id in unchanged_ids:
+                        on_polled(discord_id, False)
+
+            if not changed:
+                return updated, failed, 0
+
+            try:
+                recent, _ = await self.get_users_batch(
+                    [username for username, _, _ in changed],
+                    include_stats=False
                 )
+            except CircuitOpenError:
+                skipped = sum(len(linked) for _, linked, _ in changed)
+                skipped += sum(len(linked) for _, linked in pending)
+                pending.clear()
+                logger.warning(f"LeetCode circuit open, skipping {skipped} user(s) this iteration")
+                return updated, failed, skipped
+            except Exception as e:
+                logger.error(f"Error fetching submissions for {len(changed)} users: {e}")
+                recent = None
+
+            if recent is None:
+                return updated, failed + sum(len(linked) for _, linked, _ in changed), 0
+
+            week_ago = (datetime.now() - timedelta(days=7)).timestamp()
+            await bot.problem_cache.get_many([
+                submission["titleSlug"]
+                for username, linked, _ in changed
+                for submission in recent[username]["recent"]
+                if int(submission["timestamp"]) >= week_ago
+                and int(submission["timestamp"]) > min(user['last_submission_ts'] for user in linked)
+            ])
+
+            refreshes = []
+            usernames = {}
+            for username, linked, stats in changed:
+                for user in linked:
+                    try:
+                        refreshes.append(await self.build_refresh(
+                            bot, user['discord_id'], stats,
+                            recent[username]["recent"], user['last_submission_ts']
+                        ))
+                        usernames[user['discord_id']] = username
+                    except Exception as e:
+                        logger.error(f"Error preparing update for {username}: {e}")
+                        failed += 1
 
-            logger.info(
-                f"Updated {leetcode_username}: {total_solved} total, +{weekly_count} this week"
+            try:
+                inserted = await bot.db.refresh_users(refreshes)
+            except Exception as e:
+                logger.error(f"Error storing updates for {len(refreshes)} users: {e}")
+                return updated, failed + len(refreshes), 0
+
+            for refresh in refreshes:
+                discord_id = refresh[0]
+                if self._log_refresh(usernames[discord_id], refresh, inserted):
+                    updated += 1
+                    if on_polled:
+                        on_polled(discord_id, True)
+                else:
+                    failed += 1
+            return updated, failed, 0
+
+        engine = RefreshEngine(workers or self.workers)
+        return await engine.run(next_batch, handle)
+
+    async def update_user(self, bot, discord_id: int, leetcode_username: str):
+        """
+        Refresh one linked account. Concurrent refreshes of the same account
+        (e.g. /update racing submission_checker) share a single run and result.
+        """
+        return await self._flights.do(
+            ('update', discord_id, leetcode_username.lower()),
+            lambda: self._update_user(bot, discord_id, leetcode_username)
+        )
+
+    async def _update_user(self, bot, discord_id: int, leetcode_username: str):
+        try:
+            user = await bot.db.get_user(discord_id)
+            user_stats = await self.get_user_stats(leetcode_username, fresh=True)
+
+            if not user_stats:
+                logger.warning(f"Could not fetch stats for {leetcode_username}")
+                return False
+
+            if user and user["total_solved"] == self.get_total_solved(user_stats):
+                await bot.db.touch_users([discord_id])
+                logger.debug(f"No new solves for {leetcode_username}")
+                return True
+
+            self.cache.invalidate_prefix(('recent', leetcode_username.lower()))
+            recent_submissions = await self.get_recent_submissions(leetcode_username, 20, fresh=True)
+            return await self.apply_user_update(
+                bot,
+                discord_id,
+                leetcode_username,
+                user_stats,
+                recent_submissions,
+                user["last_submission_ts"] if user else 0
             )
-            return True
 
         except Exception as e:
             logger.error(f"Error updating user {leetcode_username}: {e}")
             return False
+
+    async def apply_user_update(self, bot, discord_id: int, leetcode_username: str,
+                                user_stats: dict, recent_submissions: list,
+                                last_submission_ts: int = 0):
+        """
+        Store new submissions (newer than the user's watermark) and updated counters.
+        The write is a single Database.refresh_users statement, so concurrent
+        refreshes of the same account cannot lose each other's weekly counts.
+        """
+        try:
+            if not user_stats:
+                logger.warning(f"Could not fetch stats for {leetcode_username}")
+                return False
+
+            refresh = await self.build_refresh(
+                bot, discord_id, user_stats, recent_submissions, last_submission_ts
+            )
+            inserted = await bot.db.refresh_users([refresh])
+            return self._log_refresh(leetcode_username, refresh, inserted)
+
+        except Exception as e:
+            logger.error(f"Error updating user {leetcode_username}: {e}")
+            return False
+
+    async def build_refresh(self, bot, discord_id: int, user_stats: dict,
+                            recent_submissions: list, last_submission_ts: int = 0):
+        """
+        (discord_id, total_solved, submissions, watermark) for Database.refresh_users,
+        keeping only this week's submissions newer than the user's watermark
+        """
+        total_solved = self.get_total_solved(user_stats)
+
+        week_ago = datetime.now() - timedelta(days=7)
+
+        last_submission_ts = last_submission_ts or 0
+        newest_ts = max(
+            [int(submission["timestamp"]) for submission in recent_submissions],
+            default=last_submission_ts
+        )
+
+        this_week = [
+            submission for submission in recent_submissions
+            if int(submission["timestamp"]) > last_submission_ts
+            and datetime.fromtimestamp(int(submission["timestamp"])) >= week_ago
+        ]
+        difficulties = await bot.problem_cache.get_difficulties(
+            [submission["titleSlug"] for submission in this_week]
+        )
+
+        return (
+            discord_id,
+            total_solved,
+            [
+                (
+                    submission["title"],
+                    submission["titleSlug"],
+                    difficulties[submission["titleSlug"]],
+                    int(submission["timestamp"])
+                )
+                for submission in this_week
+            ],
+            max(newest_ts, last_submission_ts)
+        )
+
+    def _log_refresh(self, leetcode_username: str, refresh: tuple, inserted: dict) -> bool:
+        discord_id, total_solved, _, _ = refresh
+        if discord_id not in inserted:
+            logger.warning(f"{leetcode_username} was unlinked during refresh")
+            return False
+
+        logger.info(
+            f"Updated {leetcode_username}: {total_solved} total, +{len(inserted[discord_id])} this week"
+        )
+        return True
@@ -0,0 +1,110 @@
+import re
+import logging
+from pathlib import Path
+import asyncpg
+
+logger = logging.getLogger('discord')
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / 'migrations'
+POSTGRES_MIGRATIONS = MIGRATIONS_DIR / 'postgres'
+SQLITE_MIGRATIONS = MIGRATIONS_DIR / 'sqlite'
+MIGRATION_FILE = re.compile(r'(\d+)_(\w+)\.sql')
+
+# Arbitrary key for pg_advisory_lock, shared by every instance of the bot
+MIGRATION_LOCK_ID = 7_340_111
+
+
+def load_migrations(directory: Path) -> list:
+    """Return (version, name, sql) for every NNNN_name.sql file, ordered by version"""
+    migrations = []
+    for path in directory.glob('*.sql'):
+        match = MIGRATION_FILE.fullmatch(path.name)
+        if not match:
+            logger.warning(f'Ignoring migration file with unexpected name: {path.name}')
+            continue
+        migrations.append((int(match.group(1)), match.group(2), path.read_text()))
+
+    migrations.sort()
+    versions = [version for version, _, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError(f'Duplicate migration versions in {directory}')
+    return migrations
+
+
+async def current_version(conn) -> int:
+    try:
+        return await conn.fetchval('SELECT max(version) FROM schema_version') or 0
+    except asyncpg.UndefinedTableError:
+        return 0
+
+
+async def migrate(conn, directory: Path = POSTGRES_MIGRATIONS) -> int:
+    """
+    Bring the schema up to the newest migration and return its version.
+
+    When the schema is already current this is a single SELECT. Otherwise each
+    pending migration runs in its own transaction together with its
+    schema_version row, under a transaction-scoped advisory lock (which also
+    holds behind a transaction-mode pooler), so concurrent instances migrate once.
+    """
+    migrations = load_migrations(directory)
+    latest = migrations[-1][0] if migrations else 0
+
+    version = await current_version(conn)
+    if version >= latest:
+        logger.info(f'Database schema is current (version {version})')
+        return version
+
+    for number, name, sql in migrations:
+        if number <= version:
+            continue
+
+        async with conn.transaction():
+            await conn.execute('SELECT pg_advisory_xact_lock($1)', MIGRATION_LOCK_ID)
+            await conn.execute('''
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    version INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    applied_at TIMESTAMP DEFAULT NOW()
+                )
+            ''')
+
+            # Another instance may have migrated while we waited for the lock
+            version = await current_version(conn)
+            if number <= version:
+                continue
+
+            await conn.execute(sql)
+            await conn.execute(
+                'INSERT INTO schema_version (version, name) VALUES ($1, $2)',
+                number, name
+            )
+        version = number
+        logger.info(f'Applied migration {number:04d}_{name}')
+
+    return version
+
+
+def migrate_sqlite(conn, directory: Path = SQLITE_MIGRATIONS) -> int:
+    """
+    SQLite counterpart of `migrate` for an autocommit sqlite3 connection.
+    The version lives in PRAGMA user_version and is bumped in the same
+    transaction as each migration.
+    """
+    migrations = load_migrations(directory)
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+
+    for number, name, sql in migrations:
+        if number <= version:
+            continue
+
+        try:
+            conn.executescript(f'BEGIN IMMEDIATE;\n{sql}\nPRAGMA user_version = {number};\nCOMMIT;')
+        except Exception:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        version = number
+        logger.info(f'Applied SQLite migration {number:04d}_{name}')
+
+    return version
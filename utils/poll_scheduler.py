@@ -0,0 +1,126 @@
+import heapq
+import time
+import logging
+
+logger = logging.getLogger('discord')
+
+
+class PollScheduler:
+    """
+    Per-user polling cadence kept in a min-heap of next-due times.
+
+    A user whose stats changed is polled again after `min_interval`; every
+    poll without a change doubles the interval up to `max_interval`. Each tick
+    may start at most `budget_per_hour * tick / 3600` polls, so the upstream
+    load is capped no matter how many users are due at once. Half of each
+    tick's allowance is kept for users not polled for `max_interval` or more,
+    so users held at `min_interval` cannot starve the dormant ones.
+    """
+
+    def __init__(self, min_interval: float = 300, max_interval: float = 6 * 3600,
+                 initial_interval: float = 3600, budget_per_hour: int = None):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_interval = initial_interval
+        self.budget_per_hour = budget_per_hour
+        self._heap = []
+        self._entries = {}
+        self._allowance = 0.0
+        self._last_tick = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _push(self, discord_id: int, due: float):
+        entry = self._entries[discord_id]
+        entry['due'] = due
+        entry['version'] += 1
+        heapq.heappush(self._heap, (due, entry['version'], discord_id))
+
+    def sync(self, users: list, now: float = None):
+        """Track newly linked users (due immediately) and forget unlinked ones"""
+        now = time.time() if now is None else now
+        seen = set()
+
+        for user in users:
+            discord_id = user['discord_id']
+            seen.add(discord_id)
+
+            if discord_id in self._entries:
+                self._entries[discord_id]['user'] = user
+                continue
+
+            self._entries[discord_id] = {
+                'user': user,
+                'interval': self.initial_interval,
+                'due': now,
+                'polled': now,
+                'version': 0
+            }
+            self._push(discord_id, now)
+
+        for discord_id in list(self._entries):
+            if discord_id not in seen:
+                del self._entries[discord_id]
+
+    def _budget(self, now: float) -> int:
+        budget_per_hour = self.budget_per_hour or len(self._entries)
+        if self._last_tick is None:
+            self._allowance = budget_per_hour
+        else:
+            self._allowance += (now - self._last_tick) * budget_per_hour / 3600
+            self._allowance = min(self._allowance, budget_per_hour)
+        self._last_tick = now
+        return int(self._allowance)
+
+    def pop_due(self, now: float = None) -> list:
+        """Return user rows that are due, earliest first, within this tick's budget"""
+        now = time.time() if now is None else now
+        limit = self._budget(now)
+        due = []
+
+        starving = sorted(
+            (entry for entry in self._entries.values()
+             if entry['due'] <= now and now - entry['polled'] >= self.max_interval),
+            key=lambda entry: entry['polled']
+        )
+        for entry in starving[:(limit + 1) // 2]:
+            # Bumping the version retires its heap item; record() pushes a new one
+            entry['version'] += 1
+            due.append(entry['user'])
+
+        while self._heap and len(due) < limit:
+            due_at, version, discord_id = self._heap[0]
+            entry = self._entries.get(discord_id)
+
+            if not entry or entry['version'] != version:
+                heapq.heappop(self._heap)
+                continue
+            if due_at > now:
+                break
+
+            heapq.heappop(self._heap)
+            due.append(entry['user'])
+
+        self._allowance -= len(due)
+        return due
+
+    def record(self, discord_id: int, changed: bool, now: float = None):
+        """Adapt the user's interval after a poll and schedule the next one"""
+        entry = self._entries.get(discord_id)
+        if not entry:
+            return
+
+        now = time.time() if now is None else now
+        if changed is not None:
+            entry['polled'] = now
+        if changed:
+            entry['interval'] = self.min_interval
+        elif changed is not None:
+            entry['interval'] = min(self.max_interval, entry['interval'] * 2)
+
+        self._push(discord_id, now + entry['interval'])
+
+    def summary(self) -> str:
+        active = sum(1 for entry in self._entries.values() if entry['interval'] <= self.min_interval)
+        return f"tracked={len(self._entries)} active={active} budget={int(self._allowance)}"
@@ -0,0 +1,394 @@
+import asyncio
+import asyncpg
+import json
+import os
+import time
+from datetime import datetime
+import logging
+from utils.database import Database, pack_text, unpack_solution, week_start
+from utils.migrations import migrate
+from utils.queries import QUERIES
+
+logger = logging.getLogger('discord')
+
+STATEMENT_MODES = ('prepared', 'pooler')
+
+NOTIFY_CHANNEL = 'bot_cache_invalidation'
+# NOTIFY payloads are capped at 8000 bytes; larger key sets invalidate the whole region
+MAX_NOTIFY_PAYLOAD = 7500
+
+
+def statement_mode() -> str:
+    """
+    DATABASE_STATEMENT_MODE=pooler (the default) disables asyncpg's prepared
+    statement cache, which is safe behind PgBouncer-style transaction pooling;
+    prepared keeps the per-connection cache and must be opted into explicitly
+    for direct connections.
+    """
+    mode = (os.getenv('DATABASE_STATEMENT_MODE') or 'pooler').lower()
+    if mode not in STATEMENT_MODES:
+        raise ValueError(f"DATABASE_STATEMENT_MODE must be prepared or pooler, not {mode}")
+    return mode
+
+
+class PostgresDatabase(Database):
+    def __init__(self, database_url: str):
+        super().__init__()
+        self.pool = None
+        self.database_url = database_url
+        self.statement_mode = statement_mode()
+        self.listen_url = os.getenv('DATABASE_LISTEN_URL')
+        self._listener = None
+        self._listener_task = None
+        self._pending_notifications = {}
+        self._notify_task = None
+        self._closing = False
+        self.notifications_sent = 0
+        self.notifications_received = 0
+    
+    async def init_db(self):
+        try:
+            self.pool = await asyncpg.create_pool(
+                self.database_url,
+                min_size=1,
+                max_size=10,
+                command_timeout=60,
+                statement_cache_size=0 if self.statement_mode == 'pooler' else 100
+            )
+            
+            logger.info(f'Database pool created ({self.statement_mode} statements)')
+            async with self.pool.acquire() as conn:
+                await migrate(conn)
+        
+        except Exception as e:
+            logger.error(f'Database initialization error: {e}')
+            raise
+        
+        try:
+            await self._start_listener()
+        except Exception as e:
+            logger.warning(f'Cache invalidation listener unavailable, retrying in background: {e}')
+            self._listener_task = asyncio.create_task(self._reconnect_listener())
+    
+    async def close(self):
+        self._closing = True
+        
+        for task in (self._listener_task, self._notify_task):
+            if task and not task.done():
+                task.cancel()
+        
+        if self._listener:
+            await self._listener.close()
+            self._listener = None
+        
+        if self.pool:
+            await self.pool.close()
+            logger.info('Database pool closed')
+
+    async def _start_listener(self):
+        """
+        Hold a dedicated connection that LISTENs for other processes' writes.
+        LISTEN needs a session, so behind a transaction pooler it connects to
+        DATABASE_LISTEN_URL (a direct connection) instead.
+        """
+        if self.statement_mode == 'pooler' and not self.listen_url:
+            logger.warning(
+                'Cross-instance cache invalidation disabled: set DATABASE_LISTEN_URL '
+                'to a direct (non-pooled) connection to enable it'
+            )
+            return
+        
+        self._listener = await asyncpg.connect(self.listen_url or self.database_url)
+        await self._listener.add_listener(NOTIFY_CHANNEL, self._on_notification)
+        self._listener.add_termination_listener(self._on_listener_lost)
+        logger.info(f'Listening for cache invalidations on {NOTIFY_CHANNEL}')
+
+    def _on_listener_lost(self, conn):
+        self._listener = None
+        if not self._closing:
+            logger.warning('Cache invalidation listener disconnected, reconnecting')
+            self._listener_task = asyncio.create_task(self._reconnect_listener())
+
+    async def _reconnect_listener(self):
+        delay = 1
+        while not self._closing:
+            await asyncio.sleep(delay)
+            try:
+                await self._start_listener()
+            except Exception as e:
+                delay = min(delay * 2, 60)
+                logger.warning(f'Cache invalidation listener reconnect failed, retrying in {delay}s: {e}')
+                continue
+            
+            # Anything may have changed while we were not listening
+            for region in list(self._cache_regions):
+                self._dispatch_invalidation(region, None)
+            return
+
+    def _on_notification(self, conn, pid, channel, payload):
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning(f'Ignoring malformed cache invalidation: {payload[:100]}')
+            return
+        
+        if message.get('origin') == self.instance_id:
+            return
+        
+        self.notifications_received += 1
+        self._dispatch_invalidation(message.get('region'), message.get('keys'))
+
+    def _publish(self, region: str, keys):
+        """Queue a NOTIFY; changes made in the same moment go out as one message per region"""
+        if not self.pool or self._closing:
+            return
+        
+        if keys is None or self._pending_notifications.get(region, ()) is None:
+            self._pending_notifications[region] = None
+        else:
+            self._pending_notifications.setdefault(region, set()).update(keys)
+        
+        if self._notify_task is None or self._notify_task.done():
+            self._notify_task = asyncio.create_task(self._flush_notifications())
+
+    async def _flush_notifications(self):
+        await asyncio.sleep(0.05)
+        pending, self._pending_notifications = self._pending_notifications, {}
+        
+        for region, keys in pending.items():
+            message = {'origin': self.instance_id, 'region': region, 'keys': None}
+            if keys is not None:
+                message['keys'] = sorted(keys)
+            
+            payload = json.dumps(message)
+            if len(payload) > MAX_NOTIFY_PAYLOAD:
+                payload = json.dumps({**message, 'keys': None})
+            
+            try:
+                await self._execute('notify', NOTIFY_CHANNEL, payload)
+                self.notifications_sent += 1
+            except Exception as e:
+                logger.error(f'Error publishing cache invalidation for {region}: {e}')
+
+    def pool_status(self) -> dict:
+        if not self.pool:
+            return {}
+        return {
+            'size': self.pool.get_size(),
+            'idle': self.pool.get_idle_size(),
+            'max': self.pool.get_max_size()
+        }
+
+    async def _run(self, method: str, name: str, *args):
+        """
+        Run QUERIES[name] with conn.<method>, recording how long the pool made
+        us wait for a connection and the query latency under `name`
+        """
+        waiting = time.perf_counter()
+        async with self.pool.acquire() as conn:
+            started = time.perf_counter()
+            self.metrics.acquired(started - waiting)
+            try:
+                return await getattr(conn, method)(QUERIES[name], *args)
+            finally:
+                self.metrics.record(name, time.perf_counter() - started)
+                self.metrics.released()
+
+    async def _fetch(self, name: str, *args):
+        return await self._run('fetch', name, *args)
+
+    async def _fetchrow(self, name: str, *args):
+        return await self._run('fetchrow', name, *args)
+
+    async def _fetchval(self, name: str, *args):
+        return await self._run('fetchval', name, *args)
+
+    async def _execute(self, name: str, *args):
+        return await self._run('execute', name, *args)
+
+    async def _executemany(self, name: str, rows: list):
+        return await self._run('executemany', name, rows)
+
+    async def ping(self):
+        return await self._fetchval('ping') == 1
+    
+    async def list_tables(self):
+        rows = await self._fetch('list_tables')
+        return [row['table_name'] for row in rows]
+
+    async def link_user(self, discord_id: int, leetcode_username: str):
+        await self._execute('link_user', discord_id, leetcode_username, datetime.now())
+        self._invalidate_users([discord_id])
+    
+    async def _fetch_user(self, discord_id: int):
+        return await self._fetchrow('get_user', discord_id)
+    
+    async def get_all_users(self):
+        rows = await self._fetch('get_all_users')
+        return [(row['discord_id'], row['leetcode_username']) for row in rows]
+    
+    async def get_users_for_refresh(self):
+        return await self._fetch('get_users_for_refresh')
+    
+    async def touch_users(self, discord_ids: list):
+        await self._execute('touch_users', datetime.now(), discord_ids)
+        self._invalidate_users(discord_ids)
+    
+    async def unlink_user(self, discord_id: int):
+        await self._execute('unlink_user', discord_id)
+        self._invalidate_users([discord_id])
+    
+    async def refresh_users(self, refreshes: list) -> dict:
+        """
+        Record refreshes of many users in a single statement (and so a single
+        transaction): every user's new submissions are inserted, the ones that
+        were actually new are added to weekly_solved, and total_solved and the
+        watermark are stored. Concurrent refreshes cannot lose each other's counts.
+        """
+        if not refreshes:
+            return {}
+
+        submissions = [
+            (discord_id, *submission)
+            for discord_id, _, user_submissions, _ in refreshes
+            for submission in user_submissions
+        ]
+        sub_ids, titles, slugs, difficulties, timestamps = (
+            map(list, zip(*submissions)) if submissions else ([], [], [], [], [])
+        )
+
+        rows = await self._fetch(
+            'refresh_users',
+            [discord_id for discord_id, _, _, _ in refreshes],
+            [total_solved for _, total_solved, _, _ in refreshes],
+            [watermark or 0 for _, _, _, watermark in refreshes],
+            sub_ids, titles, slugs, difficulties, timestamps,
+            [week_start(ts) for ts in timestamps],
+            datetime.now()
+        )
+        self._invalidate_users([discord_id for discord_id, _, _, _ in refreshes])
+
+        inserted = {}
+        for row in rows:
+            new = inserted.setdefault(row['discord_id'], [])
+            if row['problem_slug'] is not None:
+                new.append((row['problem_title'], row['problem_slug'], row['difficulty'], row['timestamp']))
+        return inserted
+    
+    async def get_user_submissions_this_week(self, discord_id: int):
+        current_week = week_start(int(datetime.now().timestamp()))
+        rows = await self._fetch('get_user_submissions_this_week', discord_id, current_week)
+        return [(row['problem_title'], row['difficulty'], row['timestamp']) for row in rows]
+    
+    async def get_weekly_leaderboard(self, limit: int = 10):
+        rows = await self._fetch('get_weekly_leaderboard', limit)
+        return [(row['discord_id'], row['leetcode_username'], row['weekly_solved']) 
+                for row in rows]
+    
+    async def reset_weekly_stats(self, tiers: dict = None):
+        tiers = tiers or {}
+        rows = await self._fetch('reset_weekly_stats', list(tiers), list(tiers.values()))
+        self._invalidate_users()
+        return [(row['discord_id'], row['old_tier'], row['new_tier']) for row in rows]
+    
+    async def get_current_ai_news_assignee(self):
+        return await self._fetchrow('get_current_ai_news_assignee')
+    
+    async def set_ai_news_assignee(self, discord_id: int):
+        await self._execute('set_ai_news_assignee', discord_id)
+        self._invalidate('ai_news')
+    
+    async def mark_ai_news_complete(self, discord_id: int):
+        await self._execute('mark_ai_news_complete', discord_id)
+        self._invalidate('ai_news')
+    
+    async def get_recent_ai_news_assignees(self, weeks: int = 4):
+        rows = await self._fetch('get_recent_ai_news_assignees', weeks)
+        return [row['discord_id'] for row in rows]
+    
+    async def get_todays_challenge(self):
+        return await self._fetchrow('get_todays_challenge')
+    
+    async def post_daily_challenge(self, question_id: int, question_message_id: int):
+        await self._execute('post_daily_challenge', question_id, question_message_id)
+        self._invalidate('daily_challenges')
+    
+    async def post_challenge_solution(self, challenge_id: int, solution_message_id: int):
+        await self._execute('post_challenge_solution', solution_message_id, challenge_id)
+        self._invalidate('daily_challenges')
+    
+    async def get_posted_question_ids(self):
+        rows = await self._fetch('get_posted_question_ids')
+        return [row['question_id'] for row in rows]
+    
+    async def get_challenge_stats(self):
+        row = await self._fetchrow('get_challenge_stats')
+        return {
+            'total_posted': row['total'] or 0,
+            'solutions_posted': row['with_solution'] or 0
+        }
+    
+    async def get_problems(self, title_slugs: list):
+        rows = await self._fetch('get_problems', title_slugs)
+        return {
+            row['title_slug']: {
+                'title_slug': row['title_slug'],
+                'question_id': row['question_id'],
+                'difficulty': row['difficulty'],
+                'topic_tags': list(row['topic_tags'] or [])
+            }
+            for row in rows
+        }
+    
+    async def upsert_problems(self, problems: list):
+        if not problems:
+            return
+        
+        await self._executemany('upsert_problems', [
+            (p['title_slug'], p['question_id'], p['difficulty'], p['topic_tags'])
+            for p in problems
+        ])
+        self._invalidate('problems', [p['title_slug'] for p in problems])
+    
+    async def get_catalog_problems(self):
+        rows = await self._fetch('get_catalog_problems')
+        return [
+            {
+                'title_slug': row['title_slug'],
+                'question_id': row['question_id'],
+                'title': row['title'],
+                'difficulty': row['difficulty'],
+                'topic_tags': list(row['topic_tags'] or []),
+                'description': row['description'],
+                'paid_only': row['paid_only']
+            }
+            for row in rows
+        ]
+    
+    async def upsert_catalog_problems(self, problems: list):
+        if not problems:
+            return
+        
+        await self._executemany('upsert_catalog_problems', [
+            (p['title_slug'], p['question_id'], p['title'], p['difficulty'],
+             p['topic_tags'], p['description'], p['paid_only'])
+            for p in problems
+        ])
+        self._invalidate('problems', [p['title_slug'] for p in problems])
+
+    async def get_solutions(self, question_id: int, model: str, prompt_hash: str):
+        rows = await self._fetch('get_solutions', question_id, model, prompt_hash)
+        return {row['language']: unpack_solution(row) for row in rows}
+
+    async def upsert_solutions(self, question_id: int, model: str, prompt_hash: str, solutions: dict):
+        if not solutions:
+            return
+
+        await self._executemany('upsert_solutions', [
+            (question_id, language, model, prompt_hash, pack_text(s['solution_code']),
+             pack_text(s['explanation']), s['time_complexity'], s['space_complexity'])
+            for language, s in solutions.items()
+        ])
+
+    async def delete_solutions(self, question_id: int = None, language: str = None) -> int:
+        return await self._fetchval('delete_solutions', question_id, language)
@@ -0,0 +1,86 @@
+from collections import OrderedDict
+import logging
+
+logger = logging.getLogger('discord')
+
+class ProblemMetadataCache:
+    """
+    Slug -> problem metadata (difficulty, question id, topic tags).
+
+    Lookups go through an in-process LRU, then the problems table, and only
+    the slugs missing from both are fetched from LeetCode in one batched request.
+    """
+
+    def __init__(self, database, leetcode_api, max_size: int = 4096):
+        self.db = database
+        self.leetcode_api = leetcode_api
+        self.max_size = max_size
+        self._cache = OrderedDict()
+
+    def _remember(self, slug: str, problem: dict):
+        self._cache[slug] = problem
+        self._cache.move_to_end(slug)
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+
+    def invalidate(self, title_slugs):
+        """Forget the given slugs, or everything for None"""
+        if title_slugs is None:
+            self._cache.clear()
+            return
+        for slug in title_slugs:
+            self._cache.pop(slug, None)
+
+    async def get_many(self, title_slugs: list) -> dict:
+        found = {}
+        missing = []
+
+        for slug in dict.fromkeys(title_slugs):
+            if slug in self._cache:
+                self._cache.move_to_end(slug)
+                found[slug] = self._cache[slug]
+            else:
+                missing.append(slug)
+
+        if not missing:
+            return found
+
+        try:
+            stored = await self.db.get_problems(missing)
+        except Exception as e:
+            logger.error(f"Error reading problem metadata: {e}")
+            stored = {}
+
+        for slug, problem in stored.items():
+            self._remember(slug, problem)
+            found[slug] = problem
+
+        missing = [slug for slug in missing if slug not in stored]
+        if not missing:
+            return found
+
+        fetched = await self.leetcode_api.get_problems_metadata(missing)
+        if fetched:
+            try:
+                await self.db.upsert_problems(list(fetched.values()))
+            except Exception as e:
+                logger.error(f"Error storing problem metadata: {e}")
+
+            logger.debug(f"Fetched metadata for {len(fetched)}/{len(missing)} uncached problem(s)")
+
+        for slug, problem in fetched.items():
+            self._remember(slug, problem)
+            found[slug] = problem
+
+        return found
+
+    async def get(self, title_slug: str):
+        problems = await self.get_many([title_slug])
+        return problems.get(title_slug)
+
+    async def get_difficulties(self, title_slugs: list) -> dict:
+        problems = await self.get_many(title_slugs)
+        return {
+            slug: problems[slug]['difficulty'] if slug in problems else "Unknown"
+            for slug in title_slugs
+        }
@@ -0,0 +1,207 @@
+import asyncio
+import re
+import logging
+from bs4 import BeautifulSoup, NavigableString, Tag
+
+logger = logging.getLogger('discord')
+
+
+def _render(node, in_pre: bool = False) -> str:
+    if isinstance(node, NavigableString):
+        text = str(node)
+        return text if in_pre else re.sub(r'\s+', ' ', text)
+
+    if not isinstance(node, Tag):
+        return ''
+
+    name = node.name
+
+    if name == 'pre':
+        return f"\n```\n{node.get_text().strip()}\n```\n"
+    if name == 'br':
+        return '\n'
+    if name == 'img':
+        return ''
+
+    inner = ''.join(_render(child, in_pre) for child in node.children)
+
+    if name in ('strong', 'b'):
+        return f"**{inner.strip()}**" if inner.strip() else inner
+    if name in ('em', 'i'):
+        return f"*{inner.strip()}*" if inner.strip() else inner
+    if name == 'code':
+        return f"`{inner.strip()}`" if inner.strip() else inner
+    if name == 'sup':
+        return f"^{inner}"
+    if name == 'li':
+        return f"- {inner.strip()}\n"
+    if name in ('ul', 'ol'):
+        return f"\n{inner}\n"
+    if name in ('p', 'div'):
+        return f"{inner.strip()}\n\n"
+    return inner
+
+
+def html_to_markdown(html: str, limit: int = 4000) -> str:
+    """Convert a LeetCode HTML problem description to Discord markdown"""
+    if not html:
+        return ''
+
+    soup = BeautifulSoup(html, 'html.parser')
+    parts = _render(soup).replace('\xa0', ' ').split('```')
+
+    for idx in range(0, len(parts), 2):
+        parts[idx] = re.sub(r'[ \t]*\n[ \t]*', '\n', parts[idx])
+
+    text = re.sub(r'\n{3,}', '\n\n', '```'.join(parts)).strip()
+
+    if len(text) > limit:
+        text = text[:limit - 3].rstrip() + '...'
+    return text
+
+
+class ProblemCatalog:
+    """
+    Local copy of the full LeetCode problem list, indexed by number and slug.
+
+    The catalog is loaded from the problems table at startup and refreshed by
+    sync(), which pages through the public problem list and only fetches
+    descriptions for problems that are new or whose listing changed.
+    """
+
+    def __init__(self, database, leetcode_api):
+        self.db = database
+        self.leetcode_api = leetcode_api
+        self.by_number = {}
+        self.by_slug = {}
+
+    def __len__(self):
+        return len(self.by_slug)
+
+    def _index(self, problem: dict):
+        self.by_slug[problem['title_slug']] = problem
+        if problem.get('question_id') is not None:
+            self.by_number[problem['question_id']] = problem
+
+    async def load(self):
+        problems = await self.db.get_catalog_problems()
+        for problem in problems:
+            self._index(problem)
+        logger.info(f"Loaded {len(problems)} problems into the catalog")
+
+    def get_by_number(self, number: int):
+        return self.by_number.get(number)
+
+    def get_by_slug(self, title_slug: str):
+        return self.by_slug.get(title_slug)
+
+    def to_question(self, problem: dict) -> dict:
+        """Shape a catalog entry like the entries in leetcode75_questions.json"""
+        return {
+            'id': problem['question_id'],
+            'title': problem['title'],
+            'title_slug': problem['title_slug'],
+            'description': problem.get('description') or '',
+            'difficulty': problem.get('difficulty') or 'Unknown',
+            'topic_tags': problem.get('topic_tags') or [],
+            'leetcode_url': f"https://leetcode.com/problems/{problem['title_slug']}/"
+        }
+
+    async def fetch_by_number(self, number: int):
+        """Catalog lookup with a single network fallback for problems not synced yet"""
+        problem = self.get_by_number(number)
+        if problem:
+            return self.to_question(problem)
+
+        fetched = await self.leetcode_api.get_problem_by_number(number)
+        if not fetched:
+            return None
+
+        problem = {
+            'title_slug': fetched['title_slug'],
+            'question_id': number,
+            'title': fetched['title'],
+            'difficulty': fetched['difficulty'],
+            'topic_tags': fetched['topic_tags'],
+            'description': html_to_markdown(fetched['description']),
+            'paid_only': fetched['paid_only']
+        }
+
+        try:
+            await self.db.upsert_catalog_problems([problem])
+        except Exception as e:
+            logger.error(f"Error storing problem {number}: {e}")
+
+        self._index(problem)
+        return self.to_question(problem)
+
+    def _listing_changed(self, stored: dict, listed: dict) -> bool:
+        return (
+            stored is None
+            or stored.get('description') is None
+            or stored['question_id'] != listed['question_id']
+            or stored['title'] != listed['title']
+            or stored['difficulty'] != listed['difficulty']
+            or stored['topic_tags'] != listed['topic_tags']
+            or stored['paid_only'] != listed['paid_only']
+        )
+
+    async def sync(self, page_size: int = 100, content_batch: int = 20, delay: float = 1):
+        """
+        Page through the full problem list and store new or changed problems.
+
+        Returns:
+            (listed, changed) problem counts
+        """
+        changed = []
+        listed = 0
+        skip = 0
+
+        while True:
+            total, questions = await self.leetcode_api.get_problem_list_page(skip, page_size)
+            if not questions:
+                break
+
+            for question in questions:
+                try:
+                    question_id = int(question['questionFrontendId'])
+                except (KeyError, TypeError, ValueError):
+                    question_id = None
+
+                entry = {
+                    'title_slug': question['titleSlug'],
+                    'question_id': question_id,
+                    'title': question['title'],
+                    'difficulty': question.get('difficulty') or 'Unknown',
+                    'topic_tags': [tag['name'] for tag in question.get('topicTags') or []],
+                    'paid_only': bool(question.get('paidOnly'))
+                }
+
+                if self._listing_changed(self.by_slug.get(entry['title_slug']), entry):
+                    changed.append(entry)
+
+            listed += len(questions)
+            skip += len(questions)
+            if skip >= total:
+                break
+            await asyncio.sleep(delay)
+
+        for start in range(0, len(changed), content_batch):
+            chunk = changed[start:start + content_batch]
+            contents = await self.leetcode_api.get_problem_contents(
+                [entry['title_slug'] for entry in chunk]
+            )
+
+            for entry in chunk:
+                slug = entry['title_slug']
+                entry['description'] = html_to_markdown(contents[slug]) if slug in contents else None
+
+            await self.db.upsert_catalog_problems(chunk)
+            for entry in chunk:
+                self._index(entry)
+
+            if start + content_batch < len(changed):
+                await asyncio.sleep(delay)
+
+        logger.info(f"Problem catalog synced: {listed} listed, {len(changed)} new or changed")
+        return listed, len(changed)
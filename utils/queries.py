@@ -0,0 +1,227 @@
+"""
+Every SQL statement PostgresDatabase runs, keyed by name.
+
+Statements are parameterized ($1, $2, ...) and never built with string
+formatting, so each name maps to exactly one server-side plan; the name is
+also the label query metrics are reported under.
+"""
+
+QUERIES = {
+    'ping': 'SELECT 1',
+
+    'notify': 'SELECT pg_notify($1, $2)',
+
+    'list_tables': '''
+        SELECT table_name
+        FROM information_schema.tables
+        WHERE table_schema = 'public'
+        ORDER BY table_name
+    ''',
+
+    'link_user': '''
+        INSERT INTO users (discord_id, leetcode_username, last_updated)
+        VALUES ($1, $2, $3)
+        ON CONFLICT (discord_id)
+        DO UPDATE SET leetcode_username = $2, last_updated = $3,
+            total_solved = CASE WHEN users.leetcode_username = $2 THEN users.total_solved ELSE 0 END,
+            last_submission_ts = CASE WHEN users.leetcode_username = $2 THEN users.last_submission_ts ELSE 0 END
+    ''',
+
+    'get_user': '''
+        SELECT discord_id, leetcode_username, total_solved, weekly_solved,
+               last_updated, linked_at, last_submission_ts
+        FROM users
+        WHERE discord_id = $1
+    ''',
+
+    'get_all_users': 'SELECT discord_id, leetcode_username FROM users',
+
+    'get_users_for_refresh': '''
+        SELECT discord_id, leetcode_username, total_solved, last_submission_ts
+        FROM users
+    ''',
+
+    'touch_users': '''
+        UPDATE users SET last_updated = $1
+        WHERE discord_id = ANY($2::bigint[])
+    ''',
+
+    'unlink_user': 'DELETE FROM users WHERE discord_id = $1',
+
+    'refresh_users': '''
+        WITH refreshes AS (
+            SELECT * FROM unnest($1::bigint[], $2::int[], $3::bigint[])
+                AS r(discord_id, total_solved, last_submission_ts)
+        ), new_submissions AS (
+            INSERT INTO submissions
+            (discord_id, problem_title, problem_slug, difficulty, timestamp, week_start)
+            SELECT * FROM unnest($4::bigint[], $5::text[], $6::text[], $7::text[], $8::bigint[], $9::date[])
+                AS s(discord_id, problem_title, problem_slug, difficulty, timestamp, week_start)
+            WHERE EXISTS (SELECT 1 FROM users WHERE users.discord_id = s.discord_id)
+            ON CONFLICT (discord_id, problem_slug, timestamp) DO NOTHING
+            RETURNING discord_id, problem_title, problem_slug, difficulty, timestamp
+        ), added AS (
+            SELECT discord_id, count(*)::int AS n FROM new_submissions GROUP BY discord_id
+        ), updated AS (
+            UPDATE users
+            SET total_solved = refreshes.total_solved,
+                weekly_solved = users.weekly_solved + COALESCE(added.n, 0),
+                last_updated = $10,
+                last_submission_ts = GREATEST(users.last_submission_ts, refreshes.last_submission_ts)
+            FROM refreshes LEFT JOIN added ON added.discord_id = refreshes.discord_id
+            WHERE users.discord_id = refreshes.discord_id
+            RETURNING users.discord_id
+        )
+        SELECT updated.discord_id, new_submissions.problem_title, new_submissions.problem_slug,
+               new_submissions.difficulty, new_submissions.timestamp
+        FROM updated
+        LEFT JOIN new_submissions ON new_submissions.discord_id = updated.discord_id
+    ''',
+
+    'get_user_submissions_this_week': '''
+        SELECT problem_title, difficulty, timestamp
+        FROM submissions
+        WHERE discord_id = $1 AND week_start = $2
+        ORDER BY timestamp DESC
+    ''',
+
+    'get_weekly_leaderboard': '''
+        SELECT discord_id, leetcode_username, weekly_solved
+        FROM users
+        WHERE weekly_solved > 0
+        ORDER BY weekly_solved DESC
+        LIMIT $1
+    ''',
+
+    'reset_weekly_stats': '''
+        WITH tiers AS (
+            SELECT * FROM unnest($1::text[], $2::int[]) AS t(name, threshold)
+        ), old AS (
+            SELECT discord_id, weekly_solved
+            FROM users
+            WHERE weekly_solved <> 0
+            FOR UPDATE
+        ), reset AS (
+            UPDATE users
+            SET weekly_solved = 0
+            FROM old
+            WHERE users.discord_id = old.discord_id
+            RETURNING users.discord_id, old.weekly_solved AS old_weekly, 0 AS new_weekly
+        ), changes AS (
+            SELECT discord_id,
+                   (SELECT name FROM tiers WHERE old_weekly >= threshold
+                    ORDER BY threshold DESC LIMIT 1) AS old_tier,
+                   (SELECT name FROM tiers WHERE new_weekly >= threshold
+                    ORDER BY threshold DESC LIMIT 1) AS new_tier
+            FROM reset
+        )
+        SELECT discord_id, old_tier, new_tier
+        FROM changes
+        WHERE old_tier IS DISTINCT FROM new_tier
+    ''',
+
+    'get_current_ai_news_assignee': '''
+        SELECT discord_id, completed
+        FROM ai_news_assignments
+        WHERE assigned_date >= CURRENT_DATE - INTERVAL '7 days'
+        AND completed = FALSE
+        ORDER BY assigned_date DESC
+        LIMIT 1
+    ''',
+
+    'set_ai_news_assignee': '''
+        INSERT INTO ai_news_assignments (discord_id, assigned_date)
+        VALUES ($1, CURRENT_DATE)
+    ''',
+
+    'mark_ai_news_complete': '''
+        UPDATE ai_news_assignments
+        SET completed = TRUE, completed_date = NOW()
+        WHERE discord_id = $1
+        AND assigned_date >= CURRENT_DATE - INTERVAL '7 days'
+    ''',
+
+    'get_recent_ai_news_assignees': '''
+        SELECT DISTINCT discord_id
+        FROM ai_news_assignments
+        WHERE assigned_date >= CURRENT_DATE - $1::int * INTERVAL '1 week'
+    ''',
+
+    'get_todays_challenge': '''
+        SELECT * FROM daily_challenges
+        WHERE posted_date = CURRENT_DATE
+    ''',
+
+    'post_daily_challenge': '''
+        INSERT INTO daily_challenges (question_id, posted_date, question_message_id)
+        VALUES ($1, CURRENT_DATE, $2)
+    ''',
+
+    'post_challenge_solution': '''
+        UPDATE daily_challenges
+        SET solution_posted = TRUE, solution_message_id = $1
+        WHERE id = $2
+    ''',
+
+    'get_posted_question_ids': 'SELECT DISTINCT question_id FROM daily_challenges',
+
+    'get_challenge_stats': '''
+        SELECT COUNT(*) AS total,
+               COUNT(*) FILTER (WHERE solution_posted) AS with_solution
+        FROM daily_challenges
+    ''',
+
+    'get_problems': '''
+        SELECT title_slug, question_id, difficulty, topic_tags
+        FROM problems
+        WHERE title_slug = ANY($1::text[])
+    ''',
+
+    'upsert_problems': '''
+        INSERT INTO problems (title_slug, question_id, difficulty, topic_tags, updated_at)
+        VALUES ($1, $2, $3, $4, NOW())
+        ON CONFLICT (title_slug)
+        DO UPDATE SET question_id = $2, difficulty = $3, topic_tags = $4, updated_at = NOW()
+    ''',
+
+    'get_catalog_problems': '''
+        SELECT title_slug, question_id, title, difficulty, topic_tags, description, paid_only
+        FROM problems
+        WHERE title IS NOT NULL
+    ''',
+
+    'upsert_catalog_problems': '''
+        INSERT INTO problems
+        (title_slug, question_id, title, difficulty, topic_tags, description, paid_only, updated_at)
+        VALUES ($1, $2, $3, $4, $5, $6, $7, NOW())
+        ON CONFLICT (title_slug)
+        DO UPDATE SET question_id = $2, title = $3, difficulty = $4, topic_tags = $5,
+                      description = $6, paid_only = $7, updated_at = NOW()
+    ''',
+
+    'get_solutions': '''
+        SELECT language, solution_code, explanation, time_complexity, space_complexity
+        FROM solutions
+        WHERE question_id = $1 AND model = $2 AND prompt_hash = $3
+    ''',
+
+    'upsert_solutions': '''
+        INSERT INTO solutions
+        (question_id, language, model, prompt_hash, solution_code, explanation,
+         time_complexity, space_complexity, created_at)
+        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, NOW())
+        ON CONFLICT (question_id, language, model, prompt_hash)
+        DO UPDATE SET solution_code = $5, explanation = $6, time_complexity = $7,
+                      space_complexity = $8, created_at = NOW()
+    ''',
+
+    'delete_solutions': '''
+        WITH deleted AS (
+            DELETE FROM solutions
+            WHERE ($1::int IS NULL OR question_id = $1)
+            AND ($2::text IS NULL OR language = $2)
+            RETURNING 1
+        )
+        SELECT count(*)::int FROM deleted
+    ''',
+}
@@ -0,0 +1,107 @@
+import asyncio
+import time
+import logging
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+logger = logging.getLogger('discord')
+
+
+class CircuitOpenError(Exception):
+    """Raised when an upstream is failing and calls are short-circuited"""
+
+
+class TokenBucket:
+    """Async token bucket allowing `rate` requests per second with bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens for `seconds`, e.g. after a 429 with Retry-After"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+
+                self._refill(now)
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and rejects calls for
+    `reset_timeout` seconds, then lets a single probe through (half-open).
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 300):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.state = 'closed'
+        self.opened_at = 0.0
+
+    def allow(self) -> bool:
+        if self.state == 'closed':
+            return True
+
+        if self.state == 'open' and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = 'half_open'
+            logger.info(f"Circuit {self.name} half-open, sending probe request")
+            return True
+
+        return False
+
+    def record_success(self):
+        if self.state != 'closed':
+            logger.info(f"Circuit {self.name} closed")
+        self.failures = 0
+        self.state = 'closed'
+
+    def record_neutral(self):
+        """A response that says nothing about health; a half-open probe is handed back"""
+        if self.state == 'half_open':
+            self.state = 'open'
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == 'half_open' or self.failures >= self.failure_threshold:
+            if self.state != 'open':
+                logger.warning(f"Circuit {self.name} opened after {self.failures} failure(s)")
+            self.state = 'open'
+            self.opened_at = time.monotonic()
+
+
+def parse_retry_after(value: str, default: float, maximum: float = 300) -> float:
+    """Parse a Retry-After header given either as seconds or as an HTTP date"""
+    if not value:
+        return default
+
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return default
+
+    return min(maximum, max(0.0, seconds))
@@ -0,0 +1,85 @@
+import asyncio
+import time
+import logging
+
+logger = logging.getLogger('discord')
+
+
+class RefreshStats:
+    def __init__(self):
+        self.succeeded = 0
+        self.failed = 0
+        self.skipped = 0
+        self.jobs = 0
+        self.latencies = []
+        self.started = time.monotonic()
+        self.elapsed = 0.0
+
+    def percentile(self, pct: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+    @property
+    def throughput(self) -> float:
+        return (self.succeeded + self.failed) / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"users={self.succeeded}/{self.succeeded + self.failed} skipped={self.skipped} | "
+            f"requests={self.jobs} | {self.throughput:.1f} users/s | "
+            f"p50={self.percentile(0.5) * 1000:.0f}ms p95={self.percentile(0.95) * 1000:.0f}ms | "
+            f"took={self.elapsed:.1f}s"
+        )
+
+
+class RefreshEngine:
+    """
+    Bounded worker pool draining a dynamic work source.
+
+    `next_job()` returns the next job, or None when nothing is pending right now.
+    `handler(job)` returns (succeeded, failed, skipped) counts and may queue more work
+    (e.g. a failed batch split in half); workers only exit once nothing is
+    pending and no job is still in flight.
+    """
+
+    def __init__(self, workers: int = 4):
+        self.workers = workers
+
+    async def run(self, next_job, handler) -> RefreshStats:
+        stats = RefreshStats()
+        in_flight = 0
+        changed = asyncio.Condition()
+
+        async def worker():
+            nonlocal in_flight
+            while True:
+                async with changed:
+                    job = next_job()
+                    while job is None and in_flight:
+                        await changed.wait()
+                        job = next_job()
+                    if job is None:
+                        changed.notify_all()
+                        return
+                    in_flight += 1
+
+                started = time.monotonic()
+                try:
+                    succeeded, failed, skipped = await handler(job)
+                    stats.succeeded += succeeded
+                    stats.failed += failed
+                    stats.skipped += skipped
+                except Exception as e:
+                    logger.error(f"Refresh job failed: {e}")
+                finally:
+                    stats.latencies.append(time.monotonic() - started)
+                    stats.jobs += 1
+                    async with changed:
+                        in_flight -= 1
+                        changed.notify_all()
+
+        await asyncio.gather(*(worker() for _ in range(self.workers)))
+        stats.elapsed = time.monotonic() - stats.started
+        return stats
@@ -1,5 +1,6 @@
 import discord
 import logging
+from utils.database import tier_for
 
 logger = logging.getLogger('discord')
 
@@ -13,6 +14,74 @@ class RoleManager:
             'Bronze': {'threshold': 1, 'color': discord.Color.orange()}
         }
 
+    def tier_thresholds(self) -> dict:
+        """{role name: minimum weekly_solved}"""
+        return {name: config['threshold'] for name, config in self.role_config.items()}
+
+    def tier_for(self, weekly_solved: int):
+        """Highest role whose threshold weekly_solved reaches, or None"""
+        return tier_for(weekly_solved, self.tier_thresholds())
+
+    async def ensure_roles(self, guild: discord.Guild) -> dict:
+        """{role name: discord.Role} for every tier, creating missing roles"""
+        all_roles = {}
+
+        for role_name, config in self.role_config.items():
+            role = discord.utils.get(guild.roles, name=role_name)
+
+            if not role:
+                try:
+                    role = await guild.create_role(
+                        name=role_name,
+                        color=config['color'],
+                        reason="LeetCode bot role"
+                    )
+                    logger.info(f"Created role: {role_name}")
+                except Exception as e:
+                    logger.error(f"Failed to create role {role_name}: {e}")
+                    continue
+
+            all_roles[role_name] = role
+
+        return all_roles
+
+    async def set_tier(self, member: discord.Member, all_roles: dict, target_role):
+        """Give member the target tier role (None for no tier) and remove the others"""
+        roles_to_add = []
+        roles_to_remove = []
+
+        if target_role and target_role in all_roles:
+            if all_roles[target_role] not in member.roles:
+                roles_to_add.append(all_roles[target_role])
+
+        for role_name, role in all_roles.items():
+            if role_name != target_role and role in member.roles:
+                roles_to_remove.append(role)
+
+        try:
+            if roles_to_remove:
+                await member.remove_roles(
+                    *roles_to_remove,
+                    reason="LeetCode stats update"
+                )
+                logger.info(
+                    f"Removed roles from {member.name}: {[r.name for r in roles_to_remove]}"
+                )
+
+            if roles_to_add:
+                await member.add_roles(
+                    *roles_to_add,
+                    reason="LeetCode stats update"
+                )
+                logger.info(
+                    f"Added roles to {member.name}: {[r.name for r in roles_to_add]}"
+                )
+
+        except discord.Forbidden:
+            logger.error(f"Missing permissions to manage roles for {member.name}")
+        except Exception as e:
+            logger.error(f"Error updating roles for {member.name}: {e}")
+
     async def update_user_role(self, member: discord.Member, guild: discord.Guild):
         try:
             user = await self.db.get_user(member.id)
@@ -20,77 +89,33 @@ class RoleManager:
             if not user:
                 return
 
-            weekly_solved = user['weekly_solved']
-
-            roles_to_add = []
-            roles_to_remove = []
-            target_role = None
-
-            if weekly_solved >= self.role_config['Gold']['threshold']:
-                target_role = 'Gold'
-            elif weekly_solved >= self.role_config['Silver']['threshold']:
-                target_role = 'Silver'
-            elif weekly_solved >= self.role_config['Bronze']['threshold']:
-                target_role = 'Bronze'
-
-            all_roles = {}
-
-            for role_name, config in self.role_config.items():
-                role = discord.utils.get(guild.roles, name=role_name)
-
-                if not role:
-                    try:
-                        role = await guild.create_role(
-                            name=role_name,
-                            color=config['color'],
-                            reason="LeetCode bot role"
-                        )
-                        logger.info(f"Created role: {role_name}")
-                    except Exception as e:
-                        logger.error(f"Failed to create role {role_name}: {e}")
-                        continue
-
-                all_roles[role_name] = role
-
-            if target_role:
-                if all_roles[target_role] not in member.roles:
-                    roles_to_add.append(all_roles[target_role])
-
-                for role_name, role in all_roles.items():
-                    if role_name != target_role and role in member.roles:
-                        roles_to_remove.append(role)
-            else:
-                for role in all_roles.values():
-                    if role in member.roles:
-                        roles_to_remove.append(role)
-
-            try:
-                if roles_to_remove:
-                    await member.remove_roles(
-                        *roles_to_remove,
-                        reason="LeetCode stats update"
-                    )
-                    logger.info(
-                        f"Removed roles from {member.name}: {[r.name for r in roles_to_remove]}"
-                    )
-
-                if roles_to_add:
-                    await member.add_roles(
-                        *roles_to_add,
-                        reason="LeetCode stats update"
-                    )
-                    logger.info(
-                        f"Added roles to {member.name}: {[r.name for r in roles_to_add]}"
-                    )
-
-            except discord.Forbidden:
-                logger.error(f"Missing permissions to manage roles for {member.name}")
-            except Exception as e:
-                logger.error(f"Error updating roles for {member.name}: {e}")
+            all_roles = await self.ensure_roles(guild)
+            await self.set_tier(member, all_roles, self.tier_for(user['weekly_solved']))
 
         except Exception as e:
             logger.error(f"Error in update_user_role: {e}")
 
+    async def apply_tier_changes(self, bot, changes: list):
+        """
+        Apply (discord_id, old_tier, new_tier) changes, e.g. from
+        Database.reset_weekly_stats, in every guild the members are in.
+        """
+        for guild in bot.guilds:
+            members = []
+            for discord_id, _, new_tier in changes:
+                member = guild.get_member(discord_id)
+                if member:
+                    members.append((member, new_tier))
+
+            if not members:
+                continue
+
+            all_roles = await self.ensure_roles(guild)
+            for member, new_tier in members:
+                await self.set_tier(member, all_roles, new_tier)
+
+            logger.info(f"Updated tier roles for {len(members)} member(s) in {guild.name}")
+
     async def update_all_roles(self, bot):
         try:
             users = await self.db.get_all_users()
@@ -0,0 +1,26 @@
+import asyncio
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one in-flight task.
+
+    Every caller awaiting `do(key, fn)` while a call for `key` is running
+    receives that call's result (or exception) instead of starting its own.
+    """
+
+    def __init__(self):
+        self._flights = {}
+
+    def __contains__(self, key):
+        return key in self._flights
+
+    async def do(self, key, fn):
+        task = self._flights.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._flights[key] = task
+            task.add_done_callback(lambda _: self._flights.pop(key, None))
+
+        return await asyncio.shield(task)
@@ -0,0 +1,108 @@
+import time
+import logging
+from datetime import datetime, timezone
+
+logger = logging.getLogger('discord')
+
+
+class SolutionPregenerator:
+    """
+    Fills the SolutionStore ahead of time for the next questions in the rotation.
+
+    Runs only inside the configured UTC hours and within a daily (UTC) Groq
+    token budget; a question that still has missing languages after a run is
+    retried with exponential backoff from `base_backoff` up to `max_backoff`.
+    """
+
+    def __init__(self, store, lookahead: int = 3, token_budget: int = 60000,
+                 hours: tuple = (0, 17), base_backoff: float = 900, max_backoff: float = 4 * 3600):
+        self.store = store
+        self.lookahead = lookahead
+        self.token_budget = token_budget
+        self.hours = hours
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._retries = {}
+        self._budget_day = None
+        self._tokens_spent = 0
+        self._question_cost = 0
+        self.generated = 0
+        self.ready = 0
+        self.queued = 0
+
+    @staticmethod
+    def parse_hours(value: str) -> tuple:
+        """'0-17' -> (0, 17) UTC hours, both inclusive; wraps past midnight if start > end"""
+        start, end = (int(part) for part in value.split('-', 1))
+        return start, end
+
+    def in_window(self, now: datetime = None) -> bool:
+        hour = (now or datetime.now(timezone.utc)).hour
+        start, end = self.hours
+        return start <= hour <= end if start <= end else hour >= start or hour <= end
+
+    def _roll_budget(self):
+        today = datetime.now(timezone.utc).date()
+        if self._budget_day != today:
+            self._budget_day = today
+            self._tokens_spent = 0
+
+    def _backing_off(self, question_id: int, now: float) -> bool:
+        retry = self._retries.get(question_id)
+        return retry is not None and retry['due'] > now
+
+    def _record_failure(self, question: dict, missing: list, now: float):
+        retry = self._retries.setdefault(question['id'], {'attempts': 0, 'due': now})
+        retry['attempts'] += 1
+        delay = min(self.max_backoff, self.base_backoff * 2 ** (retry['attempts'] - 1))
+        retry['due'] = now + delay
+        logger.warning(
+            f"[PREGEN] {question['title']}: {', '.join(missing)} still missing after attempt "
+            f"{retry['attempts']}, retrying in {delay / 60:.0f}m"
+        )
+
+    async def run(self, questions: list, now: float = None) -> int:
+        """Generate whatever the given questions are missing; returns how many are fully stored"""
+        now = time.time() if now is None else now
+        self._roll_budget()
+        self.ready = 0
+        self.queued = len(questions)
+
+        for question in questions:
+            stored = await self.store.get_stored(question)
+            missing = [lang for lang in self.store.post_languages if lang not in stored]
+            if not missing:
+                self._retries.pop(question['id'], None)
+                self.ready += 1
+                continue
+
+            if self._backing_off(question['id'], now):
+                continue
+
+            if self._tokens_spent + self._question_cost > self.token_budget:
+                logger.info(f"[PREGEN] Token budget reached ({self._tokens_spent}/{self.token_budget}), stopping")
+                break
+
+            usage = {'total_tokens': 0}
+            solutions = await self.store.get_or_generate(question, missing, usage)
+            cost = usage['total_tokens']
+            self._tokens_spent += cost
+            self._question_cost = max(self._question_cost, cost)
+
+            failed = [lang for lang in missing if 'error' in solutions.get(lang, {'error': True})]
+            if failed:
+                self._record_failure(question, failed, now)
+                continue
+
+            self._retries.pop(question['id'], None)
+            self.generated += 1
+            self.ready += 1
+            logger.info(f"[PREGEN] Stored {len(missing)} solution(s) for {question['title']} ({cost} tokens)")
+
+        return self.ready
+
+    def summary(self) -> str:
+        return (
+            f"ready={self.ready}/{self.queued} generated={self.generated} "
+            f"tokens={self._tokens_spent}/{self.token_budget} retrying={len(self._retries)}"
+        )
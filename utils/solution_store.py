@@ -0,0 +1,144 @@
+import asyncio
+import hashlib
+import json
+import os
+import logging
+from utils.groq_api import LANGUAGES, PROMPT_VERSION
+
+logger = logging.getLogger('discord')
+
+class SolutionStore:
+    """
+    Generated solutions persisted per (question, language, model, prompt hash).
+
+    Stored languages are served from the database; only the missing ones are
+    sent to Groq, and only successful generations are stored. Each language
+    being generated has one shared future, so concurrent requests for it
+    (e.g. several members opening the same language) wait on a single call.
+
+    With SOLUTION_LAZY_LANGUAGES set, solutions are posted as soon as Python
+    exists and the other languages are generated the first time they are
+    picked in the language dropdown.
+    """
+
+    def __init__(self, database, groq_api):
+        self.db = database
+        self.groq_api = groq_api
+        self.lazy = os.getenv('SOLUTION_LAZY_LANGUAGES', 'false').lower() in ('1', 'true', 'yes')
+        self._pending = {}
+
+    @property
+    def post_languages(self) -> list:
+        """Languages that must exist before a solution is posted"""
+        return ["python"] if self.lazy else list(LANGUAGES)
+
+    @property
+    def model(self) -> str:
+        return self.groq_api.model
+
+    def prompt_hash(self, question: dict) -> str:
+        """Changes with the prompt version or any problem text that goes into the prompt"""
+        key = json.dumps([
+            PROMPT_VERSION,
+            question.get('title'),
+            question.get('description'),
+            question.get('difficulty'),
+            question.get('hints') or []
+        ])
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+
+    async def get_stored(self, question: dict, languages: list = None) -> dict:
+        """{language: solution} already stored for the question"""
+        try:
+            stored = await self.db.get_solutions(question['id'], self.model, self.prompt_hash(question))
+        except Exception as e:
+            logger.error(f"Error reading stored solutions for question {question['id']}: {e}")
+            return {}
+
+        if languages is None:
+            return stored
+        return {lang: stored[lang] for lang in languages if lang in stored}
+
+    async def get_or_generate(self, question: dict, languages: list = None, usage: dict = None) -> dict:
+        """
+        Solutions for the given languages (default: all), generating and
+        storing only the ones that are not stored yet. Tokens spent by this
+        call's own Groq requests are added to usage["total_tokens"]; joining a
+        generation another caller started costs nothing.
+        """
+        languages = list(languages or LANGUAGES)
+        solutions = await self.get_stored(question, languages)
+
+        missing = [lang for lang in languages if lang not in solutions]
+        if not missing:
+            logger.debug(f"Serving stored solutions for {question['title']}")
+            return solutions
+
+        logger.info(f"Generating {', '.join(missing)} for {question['title']} ({len(solutions)} stored)")
+        solutions.update(await self._generate(question, missing, usage))
+        return {lang: solutions[lang] for lang in languages if lang in solutions}
+
+    async def _generate(self, question: dict, languages: list, usage: dict = None) -> dict:
+        """
+        Generate and store `languages`, joining any generation already in
+        flight for one of them instead of requesting it again
+        """
+        prompt_hash = self.prompt_hash(question)
+        loop = asyncio.get_running_loop()
+        waiting = {}
+        owned = {}
+
+        for lang in languages:
+            key = (question['id'], prompt_hash, lang)
+            if key in self._pending:
+                waiting[lang] = self._pending[key]
+            else:
+                owned[lang] = self._pending[key] = loop.create_future()
+
+        results = {}
+        if owned:
+            try:
+                generated = await self.groq_api.generate_multi_language_solutions(
+                    question['title'],
+                    question['description'],
+                    question['difficulty'],
+                    question.get('hints', []),
+                    languages=list(owned),
+                    usage=usage
+                )
+                await self.save(question, generated)
+                results.update(generated)
+            finally:
+                for lang, future in owned.items():
+                    self._pending.pop((question['id'], prompt_hash, lang), None)
+                    if not future.done():
+                        future.set_result(results.get(lang) or {
+                            "error": "Generation did not complete",
+                            "solution_code": "// Error generating solution",
+                            "explanation": "Failed to generate solution",
+                            "time_complexity": "N/A",
+                            "space_complexity": "N/A",
+                            "language": lang
+                        })
+
+        for lang, future in waiting.items():
+            results[lang] = await asyncio.shield(future)
+
+        return results
+
+    async def save(self, question: dict, solutions: dict):
+        """Store the successful entries of a {language: solution} dict"""
+        successful = {lang: s for lang, s in solutions.items() if 'error' not in s}
+        if not successful:
+            return
+
+        try:
+            await self.db.upsert_solutions(question['id'], self.model, self.prompt_hash(question), successful)
+        except Exception as e:
+            logger.error(f"Error storing solutions for question {question['id']}: {e}")
+
+    async def invalidate(self, question_id: int = None, language: str = None) -> int:
+        """Delete stored solutions so they are regenerated on next use"""
+        deleted = await self.db.delete_solutions(question_id, language)
+        logger.info(f"Invalidated {deleted} stored solution(s) (question={question_id}, language={language})")
+        return deleted
@@ -0,0 +1,406 @@
+import asyncio
+import json
+import sqlite3
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, date, timedelta
+from utils.database import Database, UserRecord, pack_text, tier_for, unpack_solution, week_start
+from utils.migrations import migrate_sqlite
+
+logger = logging.getLogger('discord')
+
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(' '))
+sqlite3.register_converter('DATE', lambda value: date.fromisoformat(value.decode()))
+sqlite3.register_converter('TIMESTAMP', lambda value: datetime.fromisoformat(value.decode()))
+sqlite3.register_converter('BOOLEAN', lambda value: value not in (b'0', b''))
+
+
+def _dict_row(cursor, row):
+    return {column[0]: value for column, value in zip(cursor.description, row)}
+
+
+def _problem(row: dict) -> dict:
+    return {
+        'title_slug': row['title_slug'],
+        'question_id': row['question_id'],
+        'difficulty': row['difficulty'],
+        'topic_tags': json.loads(row['topic_tags'] or '[]')
+    }
+
+
+class SQLiteDatabase(Database):
+    """
+    Embedded storage for small deployments, benchmarks and local testing.
+
+    One sqlite3 connection is driven from a single worker thread, so calls
+    never block the event loop and each method's statements run back to back.
+    """
+
+    def __init__(self, path: str = ':memory:'):
+        super().__init__()
+        self.path = path
+        self.conn = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='sqlite')
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    async def _fetch(self, sql: str, *params):
+        return await self._run(lambda: self.conn.execute(sql, params).fetchall())
+
+    async def _fetchrow(self, sql: str, *params):
+        return await self._run(lambda: self.conn.execute(sql, params).fetchone())
+
+    async def _execute(self, sql: str, *params):
+        await self._run(lambda: self.conn.execute(sql, params))
+
+    async def _transaction(self, fn):
+        """Run fn(conn) on the worker thread inside BEGIN IMMEDIATE ... COMMIT"""
+        def run():
+            self.conn.execute('BEGIN IMMEDIATE')
+            try:
+                result = fn(self.conn)
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                raise
+            self.conn.execute('COMMIT')
+            return result
+
+        return await self._run(run)
+
+    async def init_db(self):
+        def connect():
+            conn = sqlite3.connect(
+                self.path,
+                detect_types=sqlite3.PARSE_DECLTYPES,
+                isolation_level=None,
+                check_same_thread=False
+            )
+            conn.execute('PRAGMA foreign_keys = ON')
+            conn.execute('PRAGMA busy_timeout = 5000')
+            if self.path != ':memory:':
+                conn.execute('PRAGMA journal_mode = WAL')
+                conn.execute('PRAGMA synchronous = NORMAL')
+            migrate_sqlite(conn)
+            conn.row_factory = _dict_row
+            return conn
+
+        try:
+            self.conn = await self._run(connect)
+            logger.info(f'SQLite database opened at {self.path}')
+
+        except Exception as e:
+            logger.error(f'Database initialization error: {e}')
+            raise
+
+    async def close(self):
+        if self.conn:
+            await self._run(self.conn.close)
+            self.conn = None
+            logger.info('SQLite database closed')
+        self._executor.shutdown(wait=False)
+
+    async def ping(self):
+        row = await self._fetchrow('SELECT 1 AS ok')
+        return row['ok'] == 1
+
+    async def list_tables(self):
+        rows = await self._fetch('''
+            SELECT name FROM sqlite_master
+            WHERE type = 'table' AND name NOT LIKE 'sqlite_%'
+            ORDER BY name
+        ''')
+        return [row['name'] for row in rows]
+
+    async def link_user(self, discord_id: int, leetcode_username: str):
+        await self._execute('''
+            INSERT INTO users (discord_id, leetcode_username, last_updated)
+            VALUES (?, ?, ?)
+            ON CONFLICT (discord_id)
+            DO UPDATE SET leetcode_username = excluded.leetcode_username,
+                last_updated = excluded.last_updated,
+                total_solved = CASE WHEN users.leetcode_username = excluded.leetcode_username
+                                    THEN users.total_solved ELSE 0 END,
+                last_submission_ts = CASE WHEN users.leetcode_username = excluded.leetcode_username
+                                          THEN users.last_submission_ts ELSE 0 END
+        ''', discord_id, leetcode_username, datetime.now())
+        self._invalidate_users([discord_id])
+
+    async def _fetch_user(self, discord_id: int):
+        return await self._fetchrow(
+            f'SELECT {UserRecord.COLUMNS} FROM users WHERE discord_id = ?', discord_id
+        )
+
+    async def get_all_users(self):
+        rows = await self._fetch('SELECT discord_id, leetcode_username FROM users')
+        return [(row['discord_id'], row['leetcode_username']) for row in rows]
+
+    async def get_users_for_refresh(self):
+        return await self._fetch('''
+            SELECT discord_id, leetcode_username, total_solved, last_submission_ts
+            FROM users
+        ''')
+
+    async def touch_users(self, discord_ids: list):
+        await self._execute('''
+            UPDATE users SET last_updated = ?
+            WHERE discord_id IN (SELECT value FROM json_each(?))
+        ''', datetime.now(), json.dumps(list(discord_ids)))
+        self._invalidate_users(discord_ids)
+
+    async def unlink_user(self, discord_id: int):
+        await self._execute('DELETE FROM users WHERE discord_id = ?', discord_id)
+        self._invalidate_users([discord_id])
+
+    @staticmethod
+    def _insert_submissions(conn, discord_id: int, submissions: list) -> list:
+        """Insert one user's (title, slug, difficulty, timestamp) submissions; returns the new ones"""
+        inserted = []
+        for title, slug, difficulty, timestamp in submissions:
+            cursor = conn.execute('''
+                INSERT INTO submissions
+                (discord_id, problem_title, problem_slug, difficulty, timestamp, week_start)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (discord_id, problem_slug, timestamp) DO NOTHING
+            ''', (discord_id, title, slug, difficulty, timestamp, week_start(timestamp)))
+            if cursor.rowcount:
+                inserted.append((title, slug, difficulty, timestamp))
+        return inserted
+
+    async def refresh_users(self, refreshes: list) -> dict:
+        if not refreshes:
+            return {}
+
+        def refresh(conn):
+            linked = {
+                row['discord_id'] for row in conn.execute(
+                    'SELECT discord_id FROM users WHERE discord_id IN (SELECT value FROM json_each(?))',
+                    (json.dumps([discord_id for discord_id, _, _, _ in refreshes]),)
+                )
+            }
+            inserted = {}
+            now = datetime.now()
+
+            for discord_id, total_solved, submissions, last_submission_ts in refreshes:
+                if discord_id not in linked:
+                    continue
+
+                new = inserted[discord_id] = self._insert_submissions(conn, discord_id, submissions)
+                conn.execute('''
+                    UPDATE users
+                    SET total_solved = ?,
+                        weekly_solved = weekly_solved + ?,
+                        last_updated = ?,
+                        last_submission_ts = MAX(last_submission_ts, ?)
+                    WHERE discord_id = ?
+                ''', (total_solved, len(new), now, last_submission_ts or 0, discord_id))
+            return inserted
+
+        inserted = await self._transaction(refresh)
+        self._invalidate_users([discord_id for discord_id, _, _, _ in refreshes])
+        return inserted
+
+    async def get_user_submissions_this_week(self, discord_id: int):
+        current_week = week_start(int(datetime.now().timestamp()))
+        rows = await self._fetch('''
+            SELECT problem_title, difficulty, timestamp
+            FROM submissions
+            WHERE discord_id = ? AND week_start = ?
+            ORDER BY timestamp DESC
+        ''', discord_id, current_week)
+        return [(row['problem_title'], row['difficulty'], row['timestamp']) for row in rows]
+
+    async def get_weekly_leaderboard(self, limit: int = 10):
+        rows = await self._fetch('''
+            SELECT discord_id, leetcode_username, weekly_solved
+            FROM users
+            WHERE weekly_solved > 0
+            ORDER BY weekly_solved DESC
+            LIMIT ?
+        ''', limit)
+        return [(row['discord_id'], row['leetcode_username'], row['weekly_solved'])
+                for row in rows]
+
+    async def reset_weekly_stats(self, tiers: dict = None):
+        def reset(conn):
+            rows = conn.execute(
+                'SELECT discord_id, weekly_solved FROM users WHERE weekly_solved <> 0'
+            ).fetchall()
+            conn.execute('UPDATE users SET weekly_solved = 0 WHERE weekly_solved <> 0')
+            return rows
+
+        rows = await self._transaction(reset)
+        self._invalidate_users()
+
+        changes = []
+        for row in rows:
+            old_tier, new_tier = tier_for(row['weekly_solved'], tiers), tier_for(0, tiers)
+            if old_tier != new_tier:
+                changes.append((row['discord_id'], old_tier, new_tier))
+        return changes
+
+    async def get_current_ai_news_assignee(self):
+        return await self._fetchrow('''
+            SELECT discord_id, completed
+            FROM ai_news_assignments
+            WHERE assigned_date >= ?
+            AND completed = 0
+            ORDER BY assigned_date DESC
+            LIMIT 1
+        ''', date.today() - timedelta(days=7))
+
+    async def set_ai_news_assignee(self, discord_id: int):
+        await self._execute('''
+            INSERT INTO ai_news_assignments (discord_id, assigned_date)
+            VALUES (?, ?)
+        ''', discord_id, date.today())
+        self._invalidate('ai_news')
+
+    async def mark_ai_news_complete(self, discord_id: int):
+        await self._execute('''
+            UPDATE ai_news_assignments
+            SET completed = 1, completed_date = ?
+            WHERE discord_id = ?
+            AND assigned_date >= ?
+        ''', datetime.now(), discord_id, date.today() - timedelta(days=7))
+        self._invalidate('ai_news')
+
+    async def get_recent_ai_news_assignees(self, weeks: int = 4):
+        rows = await self._fetch('''
+            SELECT DISTINCT discord_id
+            FROM ai_news_assignments
+            WHERE assigned_date >= ?
+        ''', date.today() - timedelta(weeks=weeks))
+        return [row['discord_id'] for row in rows]
+
+    async def get_todays_challenge(self):
+        return await self._fetchrow('''
+            SELECT * FROM daily_challenges
+            WHERE posted_date = ?
+        ''', date.today())
+
+    async def post_daily_challenge(self, question_id: int, question_message_id: int):
+        await self._execute('''
+            INSERT INTO daily_challenges (question_id, posted_date, question_message_id)
+            VALUES (?, ?, ?)
+        ''', question_id, date.today(), question_message_id)
+        self._invalidate('daily_challenges')
+
+    async def post_challenge_solution(self, challenge_id: int, solution_message_id: int):
+        await self._execute('''
+            UPDATE daily_challenges
+            SET solution_posted = 1, solution_message_id = ?
+            WHERE id = ?
+        ''', solution_message_id, challenge_id)
+        self._invalidate('daily_challenges')
+
+    async def get_posted_question_ids(self):
+        rows = await self._fetch('SELECT DISTINCT question_id FROM daily_challenges')
+        return [row['question_id'] for row in rows]
+
+    async def get_challenge_stats(self):
+        row = await self._fetchrow('''
+            SELECT COUNT(*) AS total, SUM(solution_posted) AS with_solution
+            FROM daily_challenges
+        ''')
+        return {
+            'total_posted': row['total'] or 0,
+            'solutions_posted': row['with_solution'] or 0
+        }
+
+    async def get_problems(self, title_slugs: list):
+        rows = await self._fetch('''
+            SELECT title_slug, question_id, difficulty, topic_tags
+            FROM problems
+            WHERE title_slug IN (SELECT value FROM json_each(?))
+        ''', json.dumps(list(title_slugs)))
+        return {row['title_slug']: _problem(row) for row in rows}
+
+    async def upsert_problems(self, problems: list):
+        if not problems:
+            return
+
+        await self._transaction(lambda conn: conn.executemany('''
+            INSERT INTO problems (title_slug, question_id, difficulty, topic_tags, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (title_slug)
+            DO UPDATE SET question_id = excluded.question_id, difficulty = excluded.difficulty,
+                          topic_tags = excluded.topic_tags, updated_at = excluded.updated_at
+        ''', [
+            (p['title_slug'], p['question_id'], p['difficulty'],
+             json.dumps(list(p['topic_tags'] or [])), datetime.now())
+            for p in problems
+        ]))
+        self._invalidate('problems', [p['title_slug'] for p in problems])
+
+    async def get_catalog_problems(self):
+        rows = await self._fetch('''
+            SELECT title_slug, question_id, title, difficulty, topic_tags, description, paid_only
+            FROM problems
+            WHERE title IS NOT NULL
+        ''')
+        return [
+            {
+                **_problem(row),
+                'title': row['title'],
+                'description': row['description'],
+                'paid_only': row['paid_only']
+            }
+            for row in rows
+        ]
+
+    async def upsert_catalog_problems(self, problems: list):
+        if not problems:
+            return
+
+        await self._transaction(lambda conn: conn.executemany('''
+            INSERT INTO problems
+            (title_slug, question_id, title, difficulty, topic_tags, description, paid_only, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (title_slug)
+            DO UPDATE SET question_id = excluded.question_id, title = excluded.title,
+                          difficulty = excluded.difficulty, topic_tags = excluded.topic_tags,
+                          description = excluded.description, paid_only = excluded.paid_only,
+                          updated_at = excluded.updated_at
+        ''', [
+            (p['title_slug'], p['question_id'], p['title'], p['difficulty'],
+             json.dumps(list(p['topic_tags'] or [])), p['description'], p['paid_only'],
+             datetime.now())
+            for p in problems
+        ]))
+        self._invalidate('problems', [p['title_slug'] for p in problems])
+
+    async def get_solutions(self, question_id: int, model: str, prompt_hash: str):
+        rows = await self._fetch('''
+            SELECT language, solution_code, explanation, time_complexity, space_complexity
+            FROM solutions
+            WHERE question_id = ? AND model = ? AND prompt_hash = ?
+        ''', question_id, model, prompt_hash)
+        return {row['language']: unpack_solution(row) for row in rows}
+
+    async def upsert_solutions(self, question_id: int, model: str, prompt_hash: str, solutions: dict):
+        if not solutions:
+            return
+
+        await self._transaction(lambda conn: conn.executemany('''
+            INSERT INTO solutions
+            (question_id, language, model, prompt_hash, solution_code, explanation,
+             time_complexity, space_complexity, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (question_id, language, model, prompt_hash)
+            DO UPDATE SET solution_code = excluded.solution_code, explanation = excluded.explanation,
+                          time_complexity = excluded.time_complexity,
+                          space_complexity = excluded.space_complexity, created_at = excluded.created_at
+        ''', [
+            (question_id, language, model, prompt_hash, pack_text(s['solution_code']),
+             pack_text(s['explanation']), s['time_complexity'], s['space_complexity'], datetime.now())
+            for language, s in solutions.items()
+        ]))
+
+    async def delete_solutions(self, question_id: int = None, language: str = None) -> int:
+        return await self._run(lambda: self.conn.execute('''
+            DELETE FROM solutions
+            WHERE (? IS NULL OR question_id = ?)
+            AND (? IS NULL OR language = ?)
+        ''', (question_id, question_id, language, language)).rowcount)
@@ -0,0 +1,99 @@
+import time
+from collections import OrderedDict
+from utils.single_flight import SingleFlight
+
+_MISSING = object()
+
+
+class AsyncTTLCache:
+    """
+    Size-bounded LRU cache whose entries expire after a per-entry TTL.
+
+    `None` results are cached for `negative_ttl` (e.g. unknown usernames), and
+    concurrent misses for the same key share one loader call. A load that was
+    in flight while the cache was invalidated is returned but not stored.
+    """
+
+    def __init__(self, max_size: int = 1024, default_ttl: float = 60, negative_ttl: float = 300):
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self.negative_ttl = negative_ttl
+        self._entries = OrderedDict()
+        self._loads = SingleFlight()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._generation = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return default
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key, value, ttl: float = None):
+        if value is None:
+            ttl = self.negative_ttl
+        elif ttl is None:
+            ttl = self.default_ttl
+
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key):
+        self._generation += 1
+        self._entries.pop(key, None)
+
+    def invalidate_prefix(self, prefix: tuple):
+        """Drop every tuple key starting with prefix, e.g. ('recent', username) for all limits"""
+        self._generation += 1
+        for key in [key for key in self._entries if key[:len(prefix)] == prefix]:
+            del self._entries[key]
+
+    def clear(self):
+        self._generation += 1
+        self._entries.clear()
+
+    async def get_or_load(self, key, loader, ttl: float = None):
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            if value is None:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+            return value
+
+        self.misses += 1
+
+        async def load():
+            generation = self._generation
+            result = await loader()
+            if generation == self._generation:
+                self.set(key, result, ttl)
+            return result
+
+        return await self._loads.do(key, load)
+
+    def summary(self) -> str:
+        lookups = self.hits + self.negative_hits + self.misses
+        hit_rate = (self.hits + self.negative_hits) / lookups * 100 if lookups else 0.0
+        return (
+            f"size={len(self._entries)}/{self.max_size} hits={self.hits} "
+            f"negative_hits={self.negative_hits} misses={self.misses} "
+            f"evictions={self.evictions} hit_rate={hit_rate:.0f}%"
+        )